@@ -1,13 +1,17 @@
 import sqlite3
+import threading
+import time
+from sqlite_profiles import connect
 
 class DatabaseConnection:
-    def __init__(self, db_name):
+    def __init__(self, db_name, profile=None):
         self.db_name = db_name
+        self.profile = profile
         self.connection = None
 
     def __enter__(self):
-        # Open the database connection
-        self.connection = sqlite3.connect(self.db_name)
+        # Open the database connection with the PRAGMA profile, if any
+        self.connection = connect(self.db_name, self.profile)
         return self.connection.cursor()
 
     def __exit__(self, exc_type, exc_value, traceback):
@@ -21,6 +25,115 @@ class DatabaseConnection:
                 self.connection.rollback()
             self.connection.close()
 
+def reset_connection(connection):
+    """Return a connection to a clean state: no open transaction, no temp tables."""
+    connection.rollback()
+    temp_tables = connection.execute(
+        "SELECT name FROM temp.sqlite_master WHERE type = 'table'"
+    ).fetchall()
+    for (name,) in temp_tables:
+        connection.execute(f'DROP TABLE temp."{name}"')
+
+class ConnectionPool:
+    """A bounded set of warm sqlite3 connections to one database file."""
+
+    def __init__(self, db_name, max_size=5, profile=None):
+        self.db_name = db_name
+        self.max_size = max_size
+        self.profile = profile
+        self.idle = []
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        # Reuse a warm connection if there is one, otherwise open a new one
+        with self.lock:
+            if self.idle:
+                return self.idle.pop()
+        return connect(self.db_name, self.profile, check_same_thread=False)
+
+    def release(self, connection):
+        # Keep the connection for reuse if it resets cleanly and there is room
+        try:
+            reset_connection(connection)
+        except sqlite3.Error:
+            connection.close()
+            return
+        with self.lock:
+            if len(self.idle) < self.max_size:
+                self.idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            connection.close()
+
+pools = {}
+pools_lock = threading.Lock()
+
+def get_pool(db_name, max_size=None, profile=None):
+    """Return the shared connection pool for db_name and profile.
+
+    The pool is created on first use with max_size (default 5). Later callers
+    may leave max_size out; asking for a different size than the existing
+    pool's raises ValueError rather than silently getting the other size.
+    """
+    with pools_lock:
+        pool = pools.get((db_name, profile))
+        if pool is None:
+            pool = pools[db_name, profile] = ConnectionPool(
+                db_name, 5 if max_size is None else max_size, profile)
+        elif max_size is not None and max_size != pool.max_size:
+            raise ValueError(
+                f"Connection pool for {db_name!r} already has max_size {pool.max_size}, "
+                f"not {max_size}"
+            )
+        return pool
+
+class PooledDatabaseConnection(DatabaseConnection):
+    """DatabaseConnection that checks connections out of a per-database pool.
+
+    Each with block borrows a warm connection instead of opening the file,
+    parsing the schema and warming the page cache again, and hands it back
+    (rolled back and without temp tables) when the block ends. pool_size is
+    that of the shared pool (see get_pool).
+    """
+
+    def __init__(self, db_name, pool_size=None, profile=None):
+        super().__init__(db_name, profile)
+        self.pool = get_pool(db_name, pool_size, profile)
+
+    def __enter__(self):
+        # Borrow a connection from the pool
+        self.connection = self.pool.acquire()
+        return self.connection.cursor()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.connection:
+            try:
+                if exc_type is None:
+                    # Commit changes if no exception occurred
+                    self.connection.commit()
+                else:
+                    # Rollback changes if an exception occurred
+                    self.connection.rollback()
+            finally:
+                # Return the connection to the pool instead of closing it,
+                # even if the commit failed (e.g. with SQLITE_BUSY)
+                self.pool.release(self.connection)
+                self.connection = None
+
+def time_queries(context_manager, db_name, iterations=1000):
+    """Time short queries run in a tight loop of with blocks."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with context_manager(db_name) as cursor:
+            cursor.execute("SELECT COUNT(*) FROM users")
+            cursor.fetchone()
+    return time.perf_counter() - start
+
 # Example usage:
 if __name__ == "__main__":
     # Using the context manager to perform a query
@@ -31,3 +144,8 @@ if __name__ == "__main__":
     # Print the query results
     for row in results:
         print(row)
+
+    # Compare connect-per-block with pooled connections
+    plain = time_queries(DatabaseConnection, 'user.db')
+    pooled = time_queries(PooledDatabaseConnection, 'user.db')
+    print(f"1000 queries: {plain:.3f}s unpooled, {pooled:.3f}s pooled")
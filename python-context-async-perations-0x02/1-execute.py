@@ -1,4 +1,7 @@
 import sqlite3
+import time
+from sqlite_profiles import connect
+
 
 class ExecuteQuery:
     """
@@ -11,8 +14,17 @@ class ExecuteQuery:
         db_name (str): Path to the SQLite database file
         query (str): SQL query to be executed
         params (tuple, optional): Parameters for parameterized queries
+        profile (str, optional): PRAGMA profile applied on connect (see sqlite_profiles)
+        stream (bool): Return a lazy iterator instead of a fully fetched list
+        batch_size (int, optional): In stream mode, yield lists of this many rows
+        param_sets (iterable, optional): Many parameter sets run on one connection
+        chunk_size (int): Parameter sets sent per executemany call
+        cached_statements (int, optional): Size of sqlite's compiled statement cache
+        statements (int): Statements executed for param_sets
+        elapsed (float): Seconds spent executing them
     """
-    def __init__(self, db_name, query, params=None):
+    def __init__(self, db_name, query, params=None, profile=None, stream=False, batch_size=None,
+                 param_sets=None, chunk_size=1000, cached_statements=None):
         """
         Initialize the ExecuteQuery context manager.
         
@@ -20,10 +32,39 @@ class ExecuteQuery:
             db_name (str): Path to the SQLite database file
             query (str): SQL query to be executed
             params (tuple, optional): Parameters for the query. Defaults to None.
+            profile (str, optional): PRAGMA profile such as "read-heavy".
+                Defaults to None, which sets no PRAGMAs (a journal_mode set on
+                the file by an earlier profile persists).
+            stream (bool, optional): If True, __enter__ returns an iterator
+                bound to the open cursor, valid until __exit__, so results
+                are processed in constant memory. Defaults to False.
+            batch_size (int, optional): In stream mode, yield lists of up to
+                batch_size rows fetched with fetchmany. Defaults to None
+                (yield rows one at a time).
+            param_sets (iterable, optional): Parameter sets to run query with,
+                instead of params. The first set is executed on its own; if
+                it returns rows (SELECT, RETURNING, EXPLAIN, ...) every set is
+                executed and fetched in turn, reusing the cached compiled
+                statement, otherwise the rest go through executemany in
+                chunks of chunk_size. Defaults to None.
+            chunk_size (int, optional): Parameter sets per executemany call.
+                Defaults to 1000.
+            cached_statements (int, optional): Number of compiled statements
+                sqlite keeps per connection. Defaults to None (sqlite3's 128).
         """
+        if param_sets is not None and stream:
+            raise ValueError("stream mode is not supported with param_sets")
         self.db_name = db_name
+        self.profile = profile
+        self.stream = stream
+        self.batch_size = batch_size
         self.query = query
         self.params = params if params is not None else ()
+        self.param_sets = param_sets
+        self.chunk_size = chunk_size
+        self.cached_statements = cached_statements
+        self.statements = 0
+        self.elapsed = 0.0
         self.connection = None
         self.cursor = None
         self.results = None
@@ -33,20 +74,102 @@ class ExecuteQuery:
         Open database connection and execute the query.
         
         Returns:
-            list: Results of the query execution
+            list: Results of the query execution, or an iterator over them
+                in stream mode. With param_sets, a list holding the rows of
+                each set for queries, or the total row count for other
+                statements.
         """
-        # Open the database connection
-        self.connection = sqlite3.connect(self.db_name)
+        # Open the database connection with the PRAGMA profile, if any
+        if self.cached_statements is None:
+            self.connection = connect(self.db_name, self.profile)
+        else:
+            self.connection = connect(self.db_name, self.profile,
+                                      cached_statements=self.cached_statements)
         self.cursor = self.connection.cursor()
+
+        if self.param_sets is not None:
+            self.results = self.execute_many()
+            return self.results
         
         # Execute the query with parameters
         self.cursor.execute(self.query, self.params)
         
+        if self.stream:
+            # Leave the rows on the cursor and hand back a lazy iterator
+            self.results = self.iter_batches() if self.batch_size else iter(self.cursor)
+            return self.results
+
         # Fetch all results
         self.results = self.cursor.fetchall()
         
         return self.results
 
+    def execute_many(self):
+        """
+        Run query once per parameter set on the open connection.
+        
+        Returns:
+            list or int: Rows of each set, or the total affected row count
+                ([] if param_sets is empty)
+        """
+        param_sets = iter(self.param_sets)
+        start = time.perf_counter()
+        first = next(param_sets, None)
+        if first is None:
+            return []
+
+        # Whether the statement returns rows is known once it has run
+        self.cursor.execute(self.query, first)
+        self.statements = 1
+        fetch = self.cursor.description is not None
+        results = [self.cursor.fetchall()] if fetch else max(self.cursor.rowcount, 0)
+        chunk = []
+        for params in param_sets:
+            chunk.append(params)
+            if len(chunk) >= self.chunk_size:
+                results = self.execute_chunk(chunk, fetch, results)
+                chunk = []
+        if chunk:
+            results = self.execute_chunk(chunk, fetch, results)
+        self.elapsed = time.perf_counter() - start
+        return results
+
+    def execute_chunk(self, chunk, fetch, results):
+        """Execute one chunk of parameter sets and fold it into results."""
+        if fetch:
+            for params in chunk:
+                results.append(self.cursor.execute(self.query, params).fetchall())
+        else:
+            self.cursor.executemany(self.query, chunk)
+            results += max(self.cursor.rowcount, 0)
+        self.statements += len(chunk)
+        return results
+
+    def report(self):
+        """
+        Print and return the average cost of one statement in microseconds.
+        
+        Returns:
+            float: Microseconds per statement, or 0 if none were run
+        """
+        cost = self.elapsed / self.statements * 1e6 if self.statements else 0
+        print(f"{self.statements} statements in {self.elapsed:.3f}s "
+              f"({cost:.1f} us per statement)")
+        return cost
+
+    def iter_batches(self):
+        """
+        Yield the remaining rows of the cursor in fetchmany batches.
+        
+        Yields:
+            list: Up to batch_size rows
+        """
+        while True:
+            batch = self.cursor.fetchmany(self.batch_size)
+            if not batch:
+                break
+            yield batch
+
     def __exit__(self, exc_type, exc_value, traceback):
         """
         Close the database connection, committing or rolling back as needed.
@@ -103,3 +226,22 @@ if __name__ == "__main__":
         print("Users older than 25:")
         for user in results:
             print(user)
+
+    # Stream the same query in batches instead of fetching it all up front
+    with ExecuteQuery('example.db', 'SELECT * FROM users WHERE age > ?', (25,),
+                      stream=True, batch_size=2) as batches:
+        for batch in batches:
+            print(f"Batch: {batch}")
+
+    # Insert many users over one connection, in executemany chunks
+    new_users = ((f"User {i}", 20 + i % 50) for i in range(10000))
+    with ExecuteQuery('users.db', 'INSERT INTO users (name, age) VALUES (?, ?)',
+                      param_sets=new_users, chunk_size=500) as inserted:
+        print(f"Inserted {inserted} users")
+    
+    # Run the same lookup for many ids, reusing the cached compiled statement
+    lookup = ExecuteQuery('users.db', 'SELECT name FROM users WHERE id = ?',
+                          param_sets=((i,) for i in range(1, 1001)), cached_statements=256)
+    with lookup as names:
+        print(f"Looked up {len(names)} ids")
+    lookup.report()
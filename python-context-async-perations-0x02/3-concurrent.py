@@ -1,12 +1,84 @@
 import asyncio
 import aiosqlite
 import os
+from contextlib import asynccontextmanager
 
-async def create_sample_database():
+POOL_SIZE = 4
+
+class AsyncConnectionPool:
+    """A bounded set of aiosqlite connections shared by coroutines on one event loop.
+
+    Each aiosqlite connection runs its own worker thread, so at most max_size
+    connections (and threads) are ever opened; extra callers wait in
+    acquire() until one is handed back.
+    """
+
+    def __init__(self, db_name, max_size=POOL_SIZE):
+        self.db_name = db_name
+        self.max_size = max_size
+        self.idle = []
+        self.slots = asyncio.Semaphore(max_size)
+        self.closed = False
+
+    @asynccontextmanager
+    async def acquire(self):
+        # Wait for a free slot, then reuse an idle connection or open one
+        async with self.slots:
+            if self.closed:
+                raise RuntimeError(f"Connection pool for {self.db_name} is closed")
+            db = self.idle.pop() if self.idle else await aiosqlite.connect(self.db_name)
+            try:
+                yield db
+            except BaseException:
+                # Don't hand a connection in an unknown state to the next caller
+                await db.close()
+                raise
+            if self.closed:
+                # The pool was closed while this connection was checked out
+                await db.close()
+                return
+            # Drop any uncommitted transaction before the connection is reused
+            await db.rollback()
+            self.idle.append(db)
+
+    async def close(self):
+        # Close idle connections now; checked-out ones are closed on release
+        self.closed = True
+        idle, self.idle = self.idle, []
+        for db in idle:
+            await db.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+@asynccontextmanager
+async def borrow(pool=None, db_name='users.db'):
+    """
+    Borrow a connection from pool, or from a short-lived pool if none is given.
+    
+    The short-lived pool is closed as soon as the block ends, so a coroutine
+    run on its own does not leave an aiosqlite worker thread behind.
+    """
+    if pool is not None:
+        async with pool.acquire() as db:
+            yield db
+        return
+    async with AsyncConnectionPool(db_name, max_size=1) as own_pool:
+        async with own_pool.acquire() as db:
+            yield db
+
+async def create_sample_database(pool=None):
     """
     a sample SQLite database with user data for testing.
+    
+    Args:
+        pool (AsyncConnectionPool, optional): Pool to borrow a connection
+            from. Defaults to None, which uses a connection of its own.
     """
-    async with aiosqlite.connect('users.db') as db:
+    async with borrow(pool) as db:
         await db.execute('''
             CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY,
@@ -29,26 +101,34 @@ async def create_sample_database():
         await db.executemany('INSERT OR REPLACE INTO users (name, age) VALUES (?, ?)', users)
         await db.commit()
 
-async def async_fetch_users():
+async def async_fetch_users(pool=None):
     """
     Asynchronously fetch all users from the database.
     
+    Args:
+        pool (AsyncConnectionPool, optional): Pool to borrow a connection
+            from. Defaults to None, which uses a connection of its own.
+    
     Returns:
         list: All users in the database
     """
-    async with aiosqlite.connect('users.db') as db:
+    async with borrow(pool) as db:
         async with db.execute('SELECT * FROM users') as cursor:
             users = await cursor.fetchall()
             return users
 
-async def async_fetch_older_users():
+async def async_fetch_older_users(pool=None):
     """
     Asynchronously fetch users older than 40.
     
+    Args:
+        pool (AsyncConnectionPool, optional): Pool to borrow a connection
+            from. Defaults to None, which uses a connection of its own.
+    
     Returns:
         list: Users older than 40
     """
-    async with aiosqlite.connect('users.db') as db:
+    async with borrow(pool) as db:
         async with db.execute('SELECT * FROM users WHERE age > 40') as cursor:
             older_users = await cursor.fetchall()
             return older_users
@@ -60,14 +140,16 @@ async def fetch_concurrently():
     Returns:
         tuple: Results of both concurrent queries
     """
-    # Ensure the database exists with sample data
-    await create_sample_database()
-    
-    # Use asyncio.gather to run both queries concurrently
-    all_users, older_users = await asyncio.gather(
-        async_fetch_users(),
-        async_fetch_older_users()
-    )
+    # One pool shared by all three coroutines, closed when they are done
+    async with AsyncConnectionPool('users.db') as pool:
+        # Ensure the database exists with sample data
+        await create_sample_database(pool)
+        
+        # Use asyncio.gather to run both queries concurrently over the pool
+        all_users, older_users = await asyncio.gather(
+            async_fetch_users(pool),
+            async_fetch_older_users(pool)
+        )
     
     # Print results
     print("All Users:")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the async connection pool in 3-concurrent.py.
+
+Each public coroutine is run on its own under asyncio.run in a subprocess;
+an aiosqlite worker thread left open would keep that interpreter from exiting.
+"""
+import asyncio
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+import pytest
+
+pytest.importorskip('aiosqlite')
+
+concurrent = importlib.import_module('3-concurrent')
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STANDALONE = '''
+import asyncio, importlib, sys
+sys.path.insert(0, {module_dir!r})
+module = importlib.import_module('3-concurrent')
+asyncio.run(module.create_sample_database())
+print(asyncio.run(module.{coroutine}()))
+'''
+
+
+class TestStandaloneCoroutines(unittest.TestCase):
+    """
+    Test case for running each coroutine without a pool under asyncio.run.
+    """
+
+    def run_standalone(self, coroutine):
+        """Run coroutine in a fresh interpreter and return its output."""
+        with tempfile.TemporaryDirectory() as directory:
+            result = subprocess.run(
+                [sys.executable, '-c', STANDALONE.format(module_dir=MODULE_DIR, coroutine=coroutine)],
+                cwd=directory, capture_output=True, text=True, timeout=20,
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+    def test_create_sample_database(self):
+        """create_sample_database exits cleanly on its own."""
+        self.run_standalone('create_sample_database')
+
+    def test_async_fetch_users(self):
+        """async_fetch_users returns every user and exits cleanly."""
+        self.assertIn("'Alice', 35", self.run_standalone('async_fetch_users'))
+
+    def test_async_fetch_older_users(self):
+        """async_fetch_older_users returns users over 40 and exits cleanly."""
+        output = self.run_standalone('async_fetch_older_users')
+        self.assertIn("'Bob', 42", output)
+        self.assertNotIn("'Alice'", output)
+
+    def test_fetch_concurrently(self):
+        """fetch_concurrently exits cleanly after sharing one pool."""
+        self.assertIn("Users Older than 40", self.run_standalone('fetch_concurrently'))
+
+
+class TestAsyncConnectionPool(unittest.IsolatedAsyncioTestCase):
+    """
+    Test case for the bounds and shutdown of AsyncConnectionPool.
+    """
+
+    async def asyncSetUp(self):
+        """Create a sample database in a temporary directory."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db_name = os.path.join(directory.name, 'users.db')
+        async with concurrent.AsyncConnectionPool(self.db_name) as pool:
+            await concurrent.create_sample_database(pool)
+
+    async def test_fan_out_is_bounded(self):
+        """N concurrent queries open at most max_size worker threads."""
+        before = threading.active_count()
+        async with concurrent.AsyncConnectionPool(self.db_name, max_size=3) as pool:
+            results = await asyncio.gather(
+                *[concurrent.async_fetch_older_users(pool) for _ in range(30)])
+            self.assertLessEqual(threading.active_count() - before, 3)
+        self.assertEqual(len(results), 30)
+        self.assertEqual(threading.active_count(), before)
+
+    async def test_close_while_checked_out(self):
+        """A connection released after close() is closed, not kept idle."""
+        before = threading.active_count()
+        pool = concurrent.AsyncConnectionPool(self.db_name)
+        async with pool.acquire():
+            await pool.close()
+        self.assertEqual(pool.idle, [])
+        self.assertEqual(threading.active_count(), before)
+        with self.assertRaises(RuntimeError):
+            async with pool.acquire():
+                pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared connection pools in 0-databaseconnection.py.
+"""
+import importlib
+import os
+import tempfile
+import unittest
+
+databaseconnection = importlib.import_module('0-databaseconnection')
+
+
+class TestGetPool(unittest.TestCase):
+    """
+    Test case for get_pool sizing of the shared pool.
+    """
+
+    def setUp(self):
+        """Use a fresh database file, and drop its pool afterwards."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db_name = os.path.join(directory.name, 'users.db')
+        self.addCleanup(lambda: databaseconnection.pools.pop((self.db_name, None)).close())
+
+    def test_first_caller_sets_size(self):
+        """The pool takes the first size asked for; later callers may omit it."""
+        pool = databaseconnection.get_pool(self.db_name, 50)
+        self.assertEqual(pool.max_size, 50)
+        self.assertIs(databaseconnection.get_pool(self.db_name), pool)
+        self.assertIs(databaseconnection.PooledDatabaseConnection(self.db_name).pool, pool)
+
+    def test_default_size(self):
+        """Without a size the pool holds up to 5 connections."""
+        self.assertEqual(databaseconnection.get_pool(self.db_name).max_size, 5)
+
+    def test_size_mismatch_raises(self):
+        """Asking for a different size than the existing pool's raises."""
+        databaseconnection.get_pool(self.db_name)
+        with self.assertRaises(ValueError):
+            databaseconnection.PooledDatabaseConnection(self.db_name, pool_size=50)
+        self.assertEqual(databaseconnection.get_pool(self.db_name, 5).max_size, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import sqlite3
 import functools
 from datetime import datetime
+from sqlite_profiles import connect
 
 # Database setup
 def setup_database():
@@ -32,11 +33,15 @@ def log_queries():
         return wrapper
     return decorator
 
-# Decorator to handle database connections
-def with_db_connection(func):
+# Decorator to handle database connections, optionally with a PRAGMA profile:
+# @with_db_connection or @with_db_connection(profile="read-heavy")
+def with_db_connection(func=None, *, profile=None):
+    if func is None:
+        return functools.partial(with_db_connection, profile=profile)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        connection = sqlite3.connect("test.db")
+        connection = connect("test.db", profile)
         try:
             return func(connection, *args, **kwargs)
         finally:
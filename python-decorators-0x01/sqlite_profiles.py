@@ -0,0 +1,26 @@
+"""Named PRAGMA profiles for the decorators' sqlite3 connections.
+
+A trimmed copy of python-context-async-perations-0x02/sqlite_profiles.py,
+which documents the profiles and benchmarks them; keep PROFILES in step.
+journal_mode=WAL is stored in the database file, so it persists for later
+connections, including ones opened without a profile.
+"""
+import sqlite3
+
+PROFILES = {
+    'read-heavy': (('journal_mode', 'WAL'), ('synchronous', 'NORMAL'), ('cache_size', -65536),
+                   ('mmap_size', 268435456), ('temp_store', 'MEMORY')),
+    'bulk-load': (('journal_mode', 'WAL'), ('synchronous', 'OFF'), ('cache_size', -262144),
+                  ('temp_store', 'MEMORY')),
+    'durable': (('journal_mode', 'WAL'), ('synchronous', 'FULL'), ('foreign_keys', 'ON')),
+}
+
+
+def connect(db_name, profile=None, **kwargs):
+    """Open a sqlite3 connection with a profile's PRAGMAs applied (None applies none)."""
+    if profile is not None and profile not in PROFILES:
+        raise ValueError(f"Unknown sqlite profile: {profile!r}")
+    connection = sqlite3.connect(db_name, **kwargs)
+    for pragma, value in PROFILES.get(profile, ()):
+        connection.execute(f"PRAGMA {pragma} = {value}")
+    return connection
@@ -1,38 +1,96 @@
-import mysql.connector
+import time
 from mysql.connector import Error
+from db import connect_to_prodev, release_connection
+from row_formats import iter_rows, open_cursor
+
+# Rows newer than the (updated_at, user_id) watermark, oldest first. Rows from the
+# last `lag` microseconds are left for the next poll so that transactions
+# committing out of timestamp order are not skipped. updated_at is the time the
+# writing statement started, not its commit time, so this only holds for
+# transactions shorter than lag (see follow_users).
+FOLLOW_QUERY = """
+    SELECT BIN_TO_UUID(user_id) AS user_id, name, email, age, updated_at FROM user_data
+    WHERE (updated_at, user_id) > (%s, UUID_TO_BIN(%s))
+        AND updated_at < NOW(6) - INTERVAL %s MICROSECOND
+    ORDER BY updated_at, user_id
+    LIMIT %s;
+"""
+
+START_POSITION = "1970-01-01 00:00:00|00000000-0000-0000-0000-000000000000"
+
+def watermark(row):
+    """Return the resumable follow position just after a followed row."""
+    return f"{row['updated_at'].isoformat(sep=' ')}|{row['user_id']}"
+
+def follow_users(position=None, poll_interval=1.0, batch_size=1000, lag=1.0):
+    """Yield every user row, then keep yielding rows as they are inserted or updated.
+
+    Rows come in (updated_at, user_id) order and include updated_at; pass
+    watermark(row) back as position to resume after that row. Each poll seeks
+    on the updated_at index, so following costs in proportion to the churn,
+    not the table size. Deleted rows are not reported.
+
+    updated_at is stamped when the writing statement starts, but the row only
+    becomes visible when its transaction commits. A poll skips a row whose
+    updated_at is older than the watermark by the time it commits, so lag
+    (in seconds) must exceed the longest write transaction on user_data: a
+    large seed.bulk_load_data merge or sync_data batch can run far longer
+    than the default of one second.
+    """
+    updated_at, user_id = (position or START_POSITION).split('|')
+    connection = connect_to_prodev()
+    if not connection:
+        return
 
-def connect_to_prodev():
-    """Connect to the ALX_prodev database."""
     try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root',  
-            password=' ', 
-            database='ALX_prodev'
-        )
-        if connection.is_connected():
-            return connection
+        cursor = connection.cursor(dictionary=True)
+        while True:
+            cursor.execute(FOLLOW_QUERY, (updated_at, user_id, int(lag * 1e6), batch_size))
+            rows = cursor.fetchall()
+            # End the read snapshot so the next poll sees newly committed rows
+            connection.commit()
+            for row in rows:
+                yield row
+            if rows:
+                updated_at, user_id = rows[-1]['updated_at'], rows[-1]['user_id']
+            if len(rows) < batch_size:
+                time.sleep(poll_interval)
     except Error as e:
-        print(f"Error while connecting to ALX_prodev: {e}")
-        return None
+        print(f"Error following data: {e}")
+    finally:
+        release_connection(connection)
+
+def stream_users(buffered=False, row_format='dict', follow=False, position=None, lag=1.0):
+    """Fetch rows one by one from the user_data table using a generator.
+
+    With the default buffered=False the cursor is server-side: rows are read
+    off the socket only as the consumer asks for them, so time to first row and
+    memory use do not grow with the table. If the consumer stops early, the
+    connection is closed instead of draining the rest of the result.
+    row_format selects dict, tuple, namedtuple or record rows (see row_formats).
+
+    With follow=True the generator does not stop at the end of the table but
+    tails new and updated rows, optionally from a saved position; rows are
+    then dicts. lag must exceed the longest write transaction on user_data
+    (see follow_users).
+    """
+    if follow:
+        yield from follow_users(position, lag=lag)
+        return
 
-def stream_users():
-    """Fetch rows one by one from the user_data table using a generator."""
     connection = connect_to_prodev()
     if not connection:
         return
 
     try:
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM user_data;")
-        for row in cursor:
+        cursor = open_cursor(connection, row_format, buffered=buffered)
+        cursor.execute("SELECT BIN_TO_UUID(user_id) AS user_id, name, email, age FROM user_data;")
+        for row in iter_rows(cursor, row_format):
             yield row
     except Error as e:
         print(f"Error fetching data: {e}")
     finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
+        release_connection(connection)
 
 # Example usage:
 if __name__ == "__main__":
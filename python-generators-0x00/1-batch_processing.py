@@ -1,47 +1,76 @@
-import mysql.connector
+import time
 from mysql.connector import Error
+from db import connect_to_prodev, release_connection
+from predicates import Field, compile_filters, select_query
+from prefetch import read_ahead
+from row_formats import USER_COLUMNS, convert_rows, open_cursor
 
-def connect_to_prodev():
-    """Connect to the ALX_prodev database."""
-    try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root', 
-            password=' ', 
-            database='ALX_prodev'
-        )
-        if connection.is_connected():
-            return connection
-    except Error as e:
-        print(f"Error while connecting to ALX_prodev: {e}")
-        return None
+def stream_users_in_batches(batch_size, row_format='dict', prefetch=0, columns=None,
+                            where="", params=(), adaptive=None, strict=False):
+    """Fetch rows in batches from the user_data table using a generator.
+
+    row_format selects dict, tuple, namedtuple or record rows (see row_formats).
+    With prefetch > 0 up to that many batches are fetched ahead on a background
+    thread while the consumer works on the current one. columns, where and
+    params restrict the query (see filter_users). Pass an
+    adaptive_batch.AdaptiveBatchSize as adaptive to size each fetch from the
+    observed row size and fetch time instead of batch_size; its history holds
+    the rows, bytes and ms of every batch.
+
+    Errors are printed and end the stream early, like the other example
+    generators. Pass strict=True to have them raised instead, for callers
+    whose result would be wrong if the scan stopped short.
+    """
+    if columns and tuple(columns) != USER_COLUMNS and row_format in ('namedtuple', 'record'):
+        raise ValueError(f"Row format {row_format!r} needs every user_data column")
+    if prefetch:
+        batches = stream_users_in_batches(batch_size, row_format, 0, columns, where, params,
+                                          adaptive, strict)
+        yield from read_ahead(batches, prefetch)
+        return
 
-def stream_users_in_batches(batch_size):
-    """Fetch rows in batches from the user_data table using a generator."""
     connection = connect_to_prodev()
     if not connection:
+        if strict:
+            raise Error("Could not connect to ALX_prodev")
         return
 
     try:
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM user_data;")
+        cursor = open_cursor(connection, row_format)
+        cursor.execute(select_query(columns, where), params)
         while True:
-            batch = cursor.fetchmany(batch_size)
+            start = time.perf_counter()
+            batch = cursor.fetchmany(adaptive.size if adaptive else batch_size)
             if not batch:
                 break
-            yield batch
+            if adaptive:
+                adaptive.record(batch, time.perf_counter() - start)
+            yield convert_rows(batch, row_format)
     except Error as e:
+        if strict:
+            raise
         print(f"Error fetching data: {e}")
     finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
+        release_connection(connection)
+
+def filter_users(batch_size, *predicates, columns=None, row_format='dict', prefetch=0):
+    """Yield batches of the users matching every predicate.
+
+    Comparisons, IN and BETWEEN (see predicates) are compiled into the WHERE
+    clause and columns into the select list, so only matching rows and the
+    needed columns leave MySQL. Where() predicates run on the fetched rows.
+    """
+    where, params, residual = compile_filters(predicates)
+    batches = stream_users_in_batches(batch_size, row_format, prefetch, columns, where, params)
+    for batch in batches:
+        if residual:
+            batch = [row for row in batch if all(predicate(row) for predicate in residual)]
+        if batch:
+            yield batch
 
 def batch_processing(batch_size):
     """Process each batch to filter users over the age of 25."""
-    for batch in stream_users_in_batches(batch_size):
-        filtered_users = [user for user in batch if user['age'] > 25]
-        yield filtered_users
+    yield from filter_users(batch_size, Field('age') > 25)
 
 # Example usage:
 if __name__ == "__main__":
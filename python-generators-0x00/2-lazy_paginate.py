@@ -1,49 +1,152 @@
-import mysql.connector
-from mysql.connector import Error
+import base64
+import json
+from mysql.connector import Error, InterfaceError, OperationalError
+from db import connect_to_prodev, release_connection
+from prefetch import read_ahead
+from row_formats import convert_rows, open_cursor, row_value
 
-def connect_to_prodev():
-    """Connect to the ALX_prodev database."""
+OFFSET_QUERY = "SELECT BIN_TO_UUID(user_id) AS user_id, name, email, age FROM user_data LIMIT %s OFFSET %s;"
+
+# Indexed columns keyset pagination can seek on; user_id breaks ties.
+SORT_KEYS = ('user_id', 'age', 'email')
+
+def fetch_page(connection, query, params, row_format='dict'):
+    """Run a page query on an open connection and return its rows."""
+    cursor = open_cursor(connection, row_format)
     try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root', 
-            password='',
-            database='ALX_prodev'
-        )
-        if connection.is_connected():
-            return connection
+        cursor.execute(query, params)
+        return convert_rows(cursor.fetchall(), row_format)
+    finally:
+        cursor.close()
+
+def paginate_users(page_size, offset, row_format='dict'):
+    """Fetch a page of users starting from the given offset.
+
+    row_format selects dict, tuple, namedtuple or record rows (see row_formats).
+    """
+    connection = connect_to_prodev()
+    if not connection:
+        return []
+
+    try:
+        return fetch_page(connection, OFFSET_QUERY, (page_size, offset), row_format)
     except Error as e:
-        print(f"Error while connecting to ALX_prodev: {e}")
-        return None
+        print(f"Error fetching paginated data: {e}")
+        return []
+    finally:
+        release_connection(connection)
+
+def encode_cursor(position):
+    """Encode a keyset position as an opaque, URL-safe cursor token."""
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def decode_cursor(token):
+    """Decode a cursor token produced by encode_cursor."""
+    return json.loads(base64.urlsafe_b64decode(token.encode()))
 
-def paginate_users(page_size, offset):
-    """Fetch a page of users starting from the given offset."""
+def next_cursor(page, sort_key='user_id'):
+    """Return the cursor token that resumes pagination after page."""
+    last = page[-1]
+    position = [str(row_value(last, 'user_id'))]
+    if sort_key != 'user_id':
+        position.insert(0, str(row_value(last, sort_key)))
+    return encode_cursor(position)
+
+def keyset_query(page_size, cursor=None, sort_key='user_id'):
+    """Build the (query, params) that seeks to the page after the cursor token."""
+    if sort_key not in SORT_KEYS:
+        raise ValueError(f"Unsupported sort key: {sort_key!r}")
+    order = "user_id" if sort_key == 'user_id' else f"{sort_key}, user_id"
+    where = ""
+    params = ()
+    if cursor is not None:
+        position = decode_cursor(cursor)
+        if len(position) != (1 if sort_key == 'user_id' else 2):
+            raise ValueError(f"Cursor token does not match sort key {sort_key!r}")
+        if sort_key == 'user_id':
+            where = "WHERE user_id > UUID_TO_BIN(%s)"
+        else:
+            where = f"WHERE ({sort_key}, user_id) > (%s, UUID_TO_BIN(%s))"
+        params = tuple(position)
+    query = (f"SELECT BIN_TO_UUID(user_id) AS user_id, name, email, age FROM user_data "
+             f"{where} ORDER BY {order} LIMIT %s;")
+    return query, params + (page_size,)
+
+def paginate_users_after(page_size, cursor=None, sort_key='user_id', row_format='dict'):
+    """Fetch the page of users that sorts after the cursor token.
+
+    Seeks with WHERE key > last_seen on an index instead of skipping rows with
+    OFFSET, so every page costs the same however deep it is.
+    """
+    query, params = keyset_query(page_size, cursor, sort_key)
     connection = connect_to_prodev()
     if not connection:
         return []
 
     try:
-        cursor = connection.cursor(dictionary=True)
-        query = "SELECT * FROM user_data LIMIT %s OFFSET %s;"
-        cursor.execute(query, (page_size, offset))
-        return cursor.fetchall()
+        return fetch_page(connection, query, params, row_format)
     except Error as e:
         print(f"Error fetching paginated data: {e}")
         return []
     finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
+        release_connection(connection)
+
+def fetch_page_with_reconnect(connection, query, params, row_format='dict', attempts=3, delay=1):
+    """Fetch a page, reconnecting and retrying once if the connection dropped."""
+    try:
+        return fetch_page(connection, query, params, row_format)
+    except (InterfaceError, OperationalError) as e:
+        print(f"Connection lost ({e}), reconnecting...")
+        connection.reconnect(attempts=attempts, delay=delay)
+        return fetch_page(connection, query, params, row_format)
+
+def lazy_paginate(page_size, row_format='dict', keyset=False, sort_key='user_id', cursor=None,
+                  connection=None, prefetch=0):
+    """Generator function to lazily load pages of users.
+
+    Every page is fetched over one connection held for the life of the
+    generator, reconnecting only if it drops. Pass connection to borrow one
+    (e.g. from a pool); it is then left open afterwards.
+
+    With keyset=True (or a resume cursor token) pages are read by seeking on
+    sort_key rather than by OFFSET; pass next_cursor(page, sort_key) back in as
+    cursor to resume after a given page.
+
+    With prefetch > 0 up to that many pages are fetched ahead on a background
+    thread while the consumer works on the current one.
+    """
+    if prefetch:
+        pages = lazy_paginate(page_size, row_format, keyset, sort_key, cursor, connection)
+        yield from read_ahead(pages, prefetch)
+        return
+
+    keyset = keyset or cursor is not None
+    owns_connection = connection is None
+    if owns_connection:
+        connection = connect_to_prodev()
+        if not connection:
+            return
 
-def lazy_paginate(page_size):
-    """Generator function to lazily load pages of users."""
     offset = 0
-    while True:
-        page = paginate_users(page_size, offset)
-        if not page:
-            break
-        yield page
-        offset += page_size
+    try:
+        while True:
+            if keyset:
+                query, params = keyset_query(page_size, cursor, sort_key)
+            else:
+                query, params = OFFSET_QUERY, (page_size, offset)
+            page = fetch_page_with_reconnect(connection, query, params, row_format)
+            if not page:
+                break
+            yield page
+            if keyset:
+                cursor = next_cursor(page, sort_key)
+            else:
+                offset += page_size
+    except Error as e:
+        print(f"Error fetching paginated data: {e}")
+    finally:
+        if owns_connection:
+            release_connection(connection)
 
 # Example usage:
 if __name__ == "__main__":
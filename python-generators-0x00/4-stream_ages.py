@@ -1,20 +1,10 @@
-import mysql.connector
+import math
+from array import array
+from decimal import Decimal
 from mysql.connector import Error
-
-def connect_to_prodev():
-    """Connect to the ALX_prodev database."""
-    try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root',  
-            password=' ',  
-            database='ALX_prodev'
-        )
-        if connection.is_connected():
-            return connection
-    except Error as e:
-        print(f"Error while connecting to ALX_prodev: {e}")
-        return None
+from db import connect_to_prodev, release_connection
+from age_summary import summarize_ages
+from online_stats import OnlineStats
 
 def stream_user_ages():
     """Generator function to yield user ages one by one."""
@@ -30,21 +20,141 @@ def stream_user_ages():
     except Error as e:
         print(f"Error fetching user ages: {e}")
     finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
+        release_connection(connection)
+
+def stream_user_age_batches(batch_size=10000):
+    """Generator function to yield user ages in compact array('h') batches.
+
+    Rows are fetched raw with fetchmany and packed straight into signed
+    shorts, which hold every DECIMAL(3,0) age from -999 to 999, skipping the
+    Decimal built per row by stream_user_ages().
+    """
+    connection = connect_to_prodev()
+    if not connection:
+        return
+
+    try:
+        cursor = connection.cursor(raw=True)
+        cursor.execute("SELECT age FROM user_data;")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield array('h', [int(age) for (age,) in rows])
+    except Error as e:
+        print(f"Error fetching user ages: {e}")
+    finally:
+        release_connection(connection)
+
+def describe_user_ages(quantiles=(0.5, 0.95, 0.99)):
+    """Return mean, variance and quantiles of age from one pass of stream_user_ages().
+
+    The underlying OnlineStats can be merged with those of other shards.
+    """
+    return OnlineStats().update(stream_user_ages()).summary(quantiles)
+
+# Aggregates computed in MySQL, from a single pass of exact DECIMAL sums.
+AGGREGATE_SQL = "SELECT COUNT(age), SUM(age), SUM(age * age), MIN(age), MAX(age) FROM user_data;"
+
+AGGREGATES = ('count', 'sum', 'min', 'max', 'avg', 'variance', 'stddev')
+
+def validate_aggregate(name):
+    """Raise ValueError unless name is a known aggregate or a pNN in 0..100."""
+    if name in AGGREGATES:
+        return
+    if not (name.startswith('p') and name[1:].replace('.', '', 1).isdigit()):
+        raise ValueError(f"Unknown aggregate: {name!r}")
+    if Decimal(name[1:]) > 100:
+        raise ValueError(f"Percentile must be between 0 and 100, got {name[1:]}")
+
+def percentile_age(cursor, percent, count):
+    """Return the nearest-rank percentile of age, or None if the row is gone.
+
+    The row is read in index order from the age index, so only one value
+    crosses the wire, but the OFFSET still walks rank index entries: each
+    percentile costs O(n) in the database. None is returned if rows were
+    deleted since count was taken.
+    """
+    percent = Decimal(percent)
+    if not 0 <= percent <= 100:
+        raise ValueError(f"Percentile must be between 0 and 100, got {percent}")
+    rank = max(math.ceil(percent / 100 * count), 1)
+    cursor.execute("SELECT age FROM user_data ORDER BY age LIMIT 1 OFFSET %s;", (rank - 1,))
+    row = cursor.fetchone()
+    return Decimal(row[0]) if row is not None else None
+
+def aggregate_ages(*names, reducer=None):
+    """Compute aggregates of age in the database instead of streaming every row.
+
+    names may be any of count, sum, min, max, avg, variance, stddev and pNN
+    (e.g. p50, p95; 0 <= NN <= 100). Results are exact Decimals, matching the DECIMAL(3,0)
+    column. A custom reducer (a callable over an iterable of ages) cannot be
+    pushed down and runs over stream_user_ages() instead.
+    """
+    if reducer is not None:
+        return reducer(stream_user_ages())
+    # Check every name up front, so a bad one fails even on an empty table
+    for name in names:
+        validate_aggregate(name)
+
+    connection = connect_to_prodev()
+    if not connection:
+        return {}
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute(AGGREGATE_SQL)
+        count, total, total_squares, minimum, maximum = cursor.fetchone()
+        total = Decimal(total or 0)
+        total_squares = Decimal(total_squares or 0)
+        results = {}
+        for name in names:
+            if name == 'count':
+                results[name] = count
+            elif name == 'sum':
+                results[name] = total
+            elif name in ('min', 'max'):
+                value = minimum if name == 'min' else maximum
+                results[name] = Decimal(value) if value is not None else None
+            elif not count:
+                results[name] = None
+            elif name == 'avg':
+                results[name] = total / count
+            elif name in ('variance', 'stddev'):
+                variance = (count * total_squares - total * total) / (count * count)
+                results[name] = variance if name == 'variance' else variance.sqrt()
+            else:
+                results[name] = percentile_age(cursor, name[1:], count)
+        cursor.close()
+        return results
+    except Error as e:
+        print(f"Error aggregating user ages: {e}")
+        return {}
+    finally:
+        release_connection(connection)
+
+def calculate_average_age(pushdown=False, batched=False):
+    """Calculate the average age of users using the stream_user_ages generator.
 
-def calculate_average_age():
-    """Calculate the average age of users using the stream_user_ages generator."""
-    total_age = 0
-    count = 0
+    With pushdown=True the average is computed by aggregate_ages() in MySQL
+    instead, so only the result crosses the wire. With batched=True ages are
+    streamed in array batches and reduced by age_summary.AgeSummary.
+    """
+    if pushdown:
+        average_age = aggregate_ages('avg').get('avg') or 0
+    elif batched:
+        average_age = summarize_ages(stream_user_age_batches()).mean() or 0
+    else:
+        total_age = 0
+        count = 0
 
-    for age in stream_user_ages():
-        total_age += age
-        count += 1
+        for age in stream_user_ages():
+            total_age += age
+            count += 1
 
-    average_age = total_age / count if count > 0 else 0
+        average_age = total_age / count if count > 0 else 0
     print(f"Average age of users: {average_age:.2f}")
+    return average_age
 
 # Example usage:
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+"""Adaptive fetchmany sizing for stream_users_in_batches.
+
+An AdaptiveBatchSize is handed to the streamer, which asks it for the size
+of every fetchmany call and reports back what each batch cost. It grows the
+batch while batches stay under the byte and latency budgets and shrinks it
+when wide rows or slow fetches push them over, at most doubling or halving
+per step. The caller keeps a reference to read the per-batch metrics.
+"""
+from collections import deque, namedtuple
+
+BatchMetrics = namedtuple('BatchMetrics', ('rows', 'bytes', 'ms', 'batch_size'))
+
+SAMPLE_ROWS = 16
+
+
+def estimate_row_bytes(rows):
+    """Estimate the average payload size of rows from a small sample."""
+    sample = rows[:SAMPLE_ROWS]
+    total = 0
+    for row in sample:
+        values = row.values() if isinstance(row, dict) else row
+        for value in values:
+            total += len(value) if isinstance(value, (str, bytes)) else 8
+    return total / len(sample) if sample else 0
+
+
+class AdaptiveBatchSize:
+    """Batch size controller targeting a byte budget and/or a fetch latency."""
+
+    def __init__(self, initial=100, target_bytes=1 << 20, target_ms=None,
+                 minimum=1, maximum=100000, history=100):
+        self.size = initial
+        self.target_bytes = target_bytes
+        self.target_ms = target_ms
+        self.minimum = minimum
+        self.maximum = maximum
+        self.history = deque(maxlen=history)
+
+    @property
+    def last(self):
+        """Metrics of the most recent batch, or None."""
+        return self.history[-1] if self.history else None
+
+    def record(self, rows, elapsed):
+        """Record a fetched batch and elapsed seconds; return its BatchMetrics."""
+        row_bytes = estimate_row_bytes(rows)
+        metrics = BatchMetrics(len(rows), int(row_bytes * len(rows)), elapsed * 1000, self.size)
+        self.history.append(metrics)
+
+        candidates = []
+        if self.target_bytes and row_bytes:
+            candidates.append(self.target_bytes / row_bytes)
+        if self.target_ms and metrics.ms > 0 and metrics.rows:
+            candidates.append(metrics.rows * self.target_ms / metrics.ms)
+        if candidates:
+            desired = min(candidates)
+            desired = max(self.size / 2, min(self.size * 2, desired))
+            self.size = int(max(self.minimum, min(self.maximum, desired)))
+        return metrics
@@ -0,0 +1,128 @@
+"""Batched reductions over streamed user ages.
+
+Ages arrive as compact array('h') batches (see stream_user_age_batches in
+4-stream_ages.py) instead of one Decimal at a time. AgeSummary reduces each
+batch in C: with NumPy if it is installed, otherwise with the built-in
+sum() and Counter. age is DECIMAL(3,0), so an exact count per distinct age
+in -999..999 doubles as the histogram and the quantile sketch.
+"""
+import math
+import sys
+import time
+from array import array
+from collections import Counter
+from decimal import Decimal
+from itertools import cycle, islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MIN_AGE = -999
+MAX_AGE = 999
+
+
+class AgeSummary:
+    """Running count, sum and per-age counts of batches of ages."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        # With NumPy, counts[age - MIN_AGE] is the number of rows of that age
+        self.counts = (np.zeros(MAX_AGE - MIN_AGE + 1, dtype=np.int64) if np is not None
+                       else Counter())
+
+    def add(self, batch):
+        """Fold one array('h') batch of ages into the summary."""
+        if np is not None:
+            values = np.frombuffer(batch, dtype=np.int16).astype(np.int64)
+            if len(values) and (values.min() < MIN_AGE or values.max() > MAX_AGE):
+                raise ValueError(f"Ages must be between {MIN_AGE} and {MAX_AGE}")
+            self.total += int(values.sum())
+            self.counts += np.bincount(values - MIN_AGE, minlength=MAX_AGE - MIN_AGE + 1)
+        else:
+            self.total += sum(batch)
+            self.counts.update(batch)
+        self.count += len(batch)
+        return self
+
+    def merge(self, other):
+        """Fold another summary into this one."""
+        self.count += other.count
+        self.total += other.total
+        self.counts += other.counts
+        return self
+
+    def age_counts(self):
+        """Return sorted (age, count) pairs for every age seen."""
+        if np is not None:
+            return [(int(index) + MIN_AGE, int(self.counts[index]))
+                    for index in np.flatnonzero(self.counts)]
+        return sorted(self.counts.items())
+
+    def mean(self):
+        """Return the exact mean age as a Decimal, or None if empty."""
+        return Decimal(self.total) / self.count if self.count else None
+
+    def histogram(self, bin_width=10):
+        """Return {bin start: count} for bins of bin_width years."""
+        bins = {}
+        for age, count in self.age_counts():
+            start = age - age % bin_width
+            bins[start] = bins.get(start, 0) + count
+        return bins
+
+    def quantile(self, q):
+        """Return the nearest-rank q-quantile (0 <= q <= 1), or None if empty."""
+        if not self.count:
+            return None
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for age, count in self.age_counts():
+            seen += count
+            if seen >= rank:
+                return age
+
+
+def summarize_ages(batches):
+    """Reduce an iterable of age batches to an AgeSummary."""
+    summary = AgeSummary()
+    for batch in batches:
+        summary.add(batch)
+    return summary
+
+
+def benchmark_age_reducers(sizes=(1000000, 10000000), batch_size=10000):
+    """Compare the per-row Decimal loop with the batched reducer.
+
+    Both sides start from the raw column bytes the driver reads off the wire.
+    """
+    pool = [str(age).encode() for age in range(1, 121)]
+    print(f"NumPy: {'yes' if np is not None else 'no'}")
+    for size in sizes:
+        start = time.perf_counter()
+        total_age = 0
+        count = 0
+        for raw in islice(cycle(pool), size):
+            total_age += Decimal(raw.decode())
+            count += 1
+        per_row = time.perf_counter() - start
+
+        start = time.perf_counter()
+        raws = islice(cycle(pool), size)
+        summary = AgeSummary()
+        while True:
+            batch = array('h', map(int, islice(raws, batch_size)))
+            if not batch:
+                break
+            summary.add(batch)
+        batched = time.perf_counter() - start
+
+        assert total_age / count == summary.mean()
+        print(f"{size:>10} rows: per-row {per_row:.2f}s, batched {batched:.2f}s "
+              f"({per_row / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    benchmark_age_reducers(tuple(int(size) for size in sys.argv[1:]) or (1000000, 10000000))
@@ -0,0 +1,209 @@
+"""Asyncio versions of the user_data streamers, built on aiomysql.
+
+stream_users, stream_users_in_batches, lazy_paginate and stream_user_ages
+mirror the synchronous generators but are async generators, so many scans
+can interleave on one event loop:
+
+    async for user in stream_users():
+        ...
+
+Rows are read through server-side (SS) cursors and only as the consumer asks
+for them. Connections are borrowed from an aiomysql pool, one per event loop,
+configured like the synchronous one in db.py. If a consumer stops early, the
+connection is closed instead of draining the rest of the result, and the pool
+replaces it. Await close_pool() before the event loop ends.
+"""
+import asyncio
+import weakref
+import aiomysql
+from aiomysql import Error
+from db import POOL_SIZE, load_db_config
+
+USER_QUERY = "SELECT BIN_TO_UUID(user_id) AS user_id, name, email, age FROM user_data"
+
+# Pool-creating tasks by event loop: a pool's connections belong to the loop
+# they were opened on
+pools = weakref.WeakKeyDictionary()
+
+
+async def open_pool():
+    """Open an aiomysql pool of ALX_prodev connections."""
+    return await aiomysql.create_pool(minsize=1, maxsize=POOL_SIZE, db='ALX_prodev',
+                                      **load_db_config())
+
+
+async def get_pool():
+    """Return the running event loop's ALX_prodev pool, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    task = pools.get(loop)
+    if task is None:
+        task = pools[loop] = loop.create_task(open_pool())
+    try:
+        return await task
+    except Error:
+        # Let the next caller retry instead of reusing the failure
+        if pools.get(loop) is task:
+            del pools[loop]
+        raise
+
+
+async def close_pool():
+    """Close the running event loop's pool once its connections are released."""
+    task = pools.pop(asyncio.get_running_loop(), None)
+    if task is not None:
+        pool = await task
+        pool.close()
+        await pool.wait_closed()
+
+
+async def connect_to_prodev():
+    """Borrow a connection to the ALX_prodev database from the pool."""
+    try:
+        pool = await get_pool()
+        return await pool.acquire()
+    except Error as e:
+        print(f"Error while connecting to ALX_prodev: {e}")
+        return None
+
+
+async def release_connection(connection, finished=True):
+    """Hand a connection back to the pool.
+
+    A connection abandoned with rows left on a server-side cursor (or after
+    an error) is closed first, so the next borrower cannot read them.
+    """
+    if not finished:
+        connection.close()
+    pool = await get_pool()
+    pool.release(connection)
+
+
+async def stream_users():
+    """Fetch rows one by one from the user_data table using an async generator."""
+    connection = await connect_to_prodev()
+    if not connection:
+        return
+
+    finished = False
+    try:
+        cursor = await connection.cursor(aiomysql.SSDictCursor)
+        await cursor.execute(USER_QUERY + ";")
+        while True:
+            row = await cursor.fetchone()
+            if row is None:
+                break
+            yield row
+        finished = True
+    except Error as e:
+        print(f"Error fetching data: {e}")
+    finally:
+        await release_connection(connection, finished)
+
+
+async def stream_users_in_batches(batch_size):
+    """Fetch rows in batches from the user_data table using an async generator."""
+    connection = await connect_to_prodev()
+    if not connection:
+        return
+
+    finished = False
+    try:
+        cursor = await connection.cursor(aiomysql.SSDictCursor)
+        await cursor.execute(USER_QUERY + ";")
+        while True:
+            batch = await cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+        finished = True
+    except Error as e:
+        print(f"Error fetching data: {e}")
+    finally:
+        await release_connection(connection, finished)
+
+
+async def paginate_users(connection, page_size, offset):
+    """Fetch a page of users starting from the given offset on connection."""
+    async with connection.cursor(aiomysql.DictCursor) as cursor:
+        await cursor.execute(USER_QUERY + " LIMIT %s OFFSET %s;", (page_size, offset))
+        return await cursor.fetchall()
+
+
+async def lazy_paginate(page_size):
+    """Async generator to lazily load pages of users over one connection."""
+    connection = await connect_to_prodev()
+    if not connection:
+        return
+
+    # Pages are fully fetched, so only an error leaves the connection dirty
+    offset = 0
+    finished = True
+    try:
+        while True:
+            page = await paginate_users(connection, page_size, offset)
+            if not page:
+                break
+            yield page
+            offset += page_size
+    except Error as e:
+        finished = False
+        print(f"Error fetching paginated data: {e}")
+    finally:
+        await release_connection(connection, finished)
+
+
+async def stream_user_ages():
+    """Async generator to yield user ages one by one."""
+    connection = await connect_to_prodev()
+    if not connection:
+        return
+
+    finished = False
+    try:
+        cursor = await connection.cursor(aiomysql.SSCursor)
+        await cursor.execute("SELECT age FROM user_data;")
+        while True:
+            row = await cursor.fetchone()
+            if row is None:
+                break
+            yield row[0]
+        finished = True
+    except Error as e:
+        print(f"Error fetching user ages: {e}")
+    finally:
+        await release_connection(connection, finished)
+
+
+async def calculate_average_age():
+    """Calculate the average age of users using the stream_user_ages async generator."""
+    total_age = 0
+    count = 0
+
+    async for age in stream_user_ages():
+        total_age += age
+        count += 1
+
+    return total_age / count if count > 0 else 0
+
+
+async def count_users():
+    """Count users by paging through them."""
+    count = 0
+    async for page in lazy_paginate(100):
+        count += len(page)
+    return count
+
+
+async def main():
+    # Both scans interleave on the one event loop, over the shared pool
+    try:
+        average_age, users = await asyncio.gather(calculate_average_age(), count_users())
+    finally:
+        await close_pool()
+    print(f"Average age of users: {average_age:.2f}")
+    print(f"Number of users: {users}")
+
+
+# Example usage:
+if __name__ == "__main__":
+    asyncio.run(main())
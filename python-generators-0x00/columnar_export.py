@@ -0,0 +1,107 @@
+"""Columnar snapshots of user_data with Apache Arrow.
+
+export_user_data() streams the table through stream_users_in_batches and
+writes each batch as a record batch (Arrow IPC) or row group (Parquet), so
+memory stays bounded by the batch size. open_snapshot() memory-maps an
+Arrow IPC snapshot without copying it, and the snapshot_* functions run the
+calculate_average_age and batch_processing computations against it.
+"""
+import os
+import tempfile
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+batch_processing = __import__('1-batch_processing')
+
+USER_SCHEMA = pa.schema([
+    ('user_id', pa.string()),
+    ('name', pa.string()),
+    ('email', pa.string()),
+    ('age', pa.int16()),
+])
+
+
+def to_record_batch(rows):
+    """Turn a batch of (user_id, name, email, age) tuples into a RecordBatch."""
+    user_ids, names, emails, ages = zip(*rows)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(user_ids, pa.string()), pa.array(names, pa.string()),
+         pa.array(emails, pa.string()), pa.array([int(age) for age in ages], pa.int16())],
+        schema=USER_SCHEMA,
+    )
+
+
+def export_user_data(path, batch_size=10000, file_format='arrow'):
+    """Write user_data to an Arrow IPC ('arrow') or Parquet ('parquet') file.
+
+    The snapshot is written to a temporary file beside path and renamed into
+    place only once the whole table has been read, so a failed scan raises
+    and leaves any previous snapshot at path untouched.
+
+    Returns the number of rows written.
+    """
+    if file_format not in ('arrow', 'parquet'):
+        raise ValueError(f"Unknown file format: {file_format!r}")
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=directory)
+    os.close(fd)
+    rows_written = 0
+    try:
+        if file_format == 'arrow':
+            writer = pa.ipc.new_file(temp_path, USER_SCHEMA)
+        else:
+            writer = pq.ParquetWriter(temp_path, USER_SCHEMA)
+        try:
+            batches = batch_processing.stream_users_in_batches(
+                batch_size, row_format='tuple', strict=True)
+            for batch in batches:
+                record_batch = to_record_batch(batch)
+                if file_format == 'arrow':
+                    writer.write_batch(record_batch)
+                else:
+                    writer.write_table(pa.Table.from_batches([record_batch]))
+                rows_written += len(batch)
+        finally:
+            writer.close()
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    print(f"Exported {rows_written} rows to {path}.")
+    return rows_written
+
+
+def open_snapshot(path):
+    """Open a snapshot as a pyarrow Table.
+
+    Arrow IPC files are memory-mapped and read without copying; Parquet files
+    are decoded through a memory map.
+    """
+    if str(path).endswith('.parquet'):
+        return pq.read_table(path, memory_map=True)
+    return pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+
+
+def snapshot_average_age(table):
+    """Calculate the average age of users in a snapshot."""
+    average_age = pc.mean(table['age']).as_py() or 0
+    print(f"Average age of users: {average_age:.2f}")
+    return average_age
+
+
+def snapshot_batch_processing(table, batch_size):
+    """Yield batches of users over the age of 25 from a snapshot."""
+    over_25 = table.filter(pc.greater(table['age'], 25))
+    for record_batch in over_25.to_batches(max_chunksize=batch_size):
+        yield record_batch.to_pylist()
+
+
+# Example usage:
+if __name__ == "__main__":
+    export_user_data('user_data.arrow')
+    snapshot = open_snapshot('user_data.arrow')
+    snapshot_average_age(snapshot)
+    for processed_batch in snapshot_batch_processing(snapshot, 10):
+        print(f"Processed batch: {processed_batch}")
+        break
@@ -0,0 +1,103 @@
+"""Shared MySQL connection layer for the seeder and the user_data streamers.
+
+load_db_config() resolves the server credentials, connect_to_prodev() borrows
+from a per-process connection pool and release_connection() hands connections
+back, dropping any that were abandoned mid-result.
+"""
+import configparser
+import multiprocessing
+import os
+import threading
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool
+
+# Credentials come from MYSQL_* environment variables, then the [mysql] section
+# of the file named by ALX_PRODEV_CONFIG (db.ini by default), then these defaults.
+DB_DEFAULTS = {'host': 'localhost', 'port': '3306', 'user': 'root', 'password': ''}
+
+def load_db_config():
+    """Return the MySQL server credentials as connect() keyword arguments."""
+    config = dict(DB_DEFAULTS)
+    parser = configparser.ConfigParser()
+    if parser.read(os.environ.get('ALX_PRODEV_CONFIG', 'db.ini')) and parser.has_section('mysql'):
+        config.update({key: parser.get('mysql', key) for key in DB_DEFAULTS if parser.has_option('mysql', key)})
+    for key in DB_DEFAULTS:
+        config[key] = os.environ.get(f"MYSQL_{key.upper()}", config[key])
+    config['port'] = int(config['port'])
+    return config
+
+POOL_SIZE = int(os.environ.get('ALX_PRODEV_POOL_SIZE', '5'))
+
+pool = None
+pool_pid = None
+pool_lock = threading.Lock()
+
+def get_pool(pool_size=None):
+    """Return the process-wide ALX_prodev connection pool, creating it on first use.
+
+    A pool inherited from a parent process (e.g. by --workers) is never reused.
+    The pool opens all its connections up front, so worker processes (seed
+    partitions, parallel_scan shards), which use one connection each, get a
+    pool of one unless pool_size says otherwise.
+    """
+    global pool, pool_pid
+    if pool_size is None:
+        pool_size = 1 if multiprocessing.parent_process() is not None else POOL_SIZE
+    with pool_lock:
+        if pool is None or pool_pid != os.getpid():
+            pool = MySQLConnectionPool(
+                pool_name='alx_prodev',
+                pool_size=pool_size,
+                pool_reset_session=True,
+                database='ALX_prodev',
+                **load_db_config()
+            )
+            pool_pid = os.getpid()
+        return pool
+
+def connect_to_prodev(allow_local_infile=False):
+    """Connect to the ALX_prodev database.
+
+    Connections are borrowed from the shared pool and health-checked with a
+    ping (reconnecting if the server dropped them); close() hands them back.
+    If the pool is exhausted, or LOAD DATA LOCAL INFILE is needed, a dedicated
+    connection is opened instead.
+    """
+    try:
+        if not allow_local_infile:
+            try:
+                connection = get_pool().get_connection()
+                connection.ping(reconnect=True, attempts=3, delay=1)
+                return connection
+            except PoolError:
+                pass
+        return mysql.connector.connect(
+            database='ALX_prodev',
+            allow_local_infile=allow_local_infile,
+            **load_db_config()
+        )
+    except Error as e:
+        print(f"Error while connecting to ALX_prodev: {e}")
+        return None
+
+def release_connection(connection):
+    """Close a connection, or return it to the pool, even mid-result.
+
+    A connection abandoned with unread rows (e.g. a stream the consumer broke
+    out of) can be neither reset nor health-checked, so its socket is dropped
+    first. A pooled one then goes back to the pool disconnected, and the pool
+    reconnects it on its next checkout.
+    """
+    try:
+        if connection.unread_result:
+            connection.disconnect()
+    except Error as e:
+        print(f"Error while dropping connection: {e}")
+    try:
+        connection.close()
+    except Error:
+        # A dropped pooled connection cannot reset its session, but close()
+        # has still handed it back to the pool
+        pass
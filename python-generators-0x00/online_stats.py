@@ -0,0 +1,146 @@
+"""Mergeable one-pass statistics for streamed values such as user ages.
+
+RunningStats keeps count, mean and variance with Welford's update in O(1)
+memory. QuantileSketch is a DDSketch-style log-bucket histogram: quantiles
+come back within a fixed relative error, memory grows with log(max/min)
+rather than with the number of values, and merging two sketches gives the
+same buckets as one sketch fed both streams. OnlineStats bundles the two,
+so partial results from shards or workers can be combined with merge().
+"""
+import math
+
+
+class RunningStats:
+    """Count, mean, variance, min and max via Welford's online algorithm."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        return self
+
+    def merge(self, other):
+        """Combine with another RunningStats (Chan et al. parallel update)."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Population variance, or None if empty."""
+        return self.m2 / self.count if self.count else None
+
+    @property
+    def stddev(self):
+        """Population standard deviation, or None if empty."""
+        return math.sqrt(self.variance) if self.count else None
+
+
+class QuantileSketch:
+    """Log-bucket quantile sketch over non-negative values.
+
+    Any quantile it returns is within relative_accuracy of the true value.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        value = float(value)
+        if value < 0:
+            raise ValueError("QuantileSketch only accepts non-negative values")
+        if value == 0:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        return self
+
+    def merge(self, other):
+        """Combine with a sketch of the same relative accuracy."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Return the q-quantile (0 <= q <= 1), or None if empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class OnlineStats:
+    """RunningStats and a QuantileSketch fed from the same single pass."""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.moments = RunningStats()
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value):
+        self.moments.add(value)
+        self.sketch.add(value)
+        return self
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def summary(self, quantiles=(0.5, 0.95, 0.99)):
+        """Return count, mean, variance, stddev, min, max and pNN values."""
+        result = {
+            'count': self.moments.count,
+            'mean': self.moments.mean if self.moments.count else None,
+            'variance': self.moments.variance,
+            'stddev': self.moments.stddev,
+            'min': self.moments.min,
+            'max': self.moments.max,
+        }
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = self.sketch.quantile(q)
+        return result
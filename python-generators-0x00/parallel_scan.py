@@ -0,0 +1,109 @@
+"""Sharded parallel scan of user_data across a process pool.
+
+The 128-bit user_id space is cut into equal key ranges. Random (uuid4) and
+email-derived (uuid5) ids are spread uniformly over it, so the shards come
+out roughly the same size. Each shard is read by stream_users_in_batches
+over its own connection in a worker process. The batches are mapped and
+reduced there, and only the per-shard results are sent back and combined.
+
+mapper, reducer and combine run in worker processes, so they must be
+picklable: module-level functions rather than lambdas.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from predicates import Field, compile_filters
+
+batch_processing = __import__('1-batch_processing')
+
+KEY_SPACE = 1 << 128
+
+
+def shard_ranges(shards):
+    """Split the user_id key space into shards (low, high) hex ranges.
+
+    high is None for the last shard, which runs to the end of the key space.
+    """
+    bounds = [KEY_SPACE * number // shards for number in range(shards)]
+    ranges = []
+    for number, low in enumerate(bounds):
+        high = bounds[number + 1] if number + 1 < shards else None
+        ranges.append((f"{low:032x}", None if high is None else f"{high:032x}"))
+    return ranges
+
+
+def range_filter(low, high):
+    """Return the (where, params) restricting user_id to [low, high)."""
+    if high is None:
+        return "user_id >= UNHEX(%s)", (low,)
+    return "user_id >= UNHEX(%s) AND user_id < UNHEX(%s)", (low, high)
+
+
+def scan_shard(low, high, mapper, reducer, initial, batch_size=1000, predicates=(),
+               columns=None, row_format='dict'):
+    """Scan one key range and reduce mapper(batch) over its batches.
+
+    The shard is read with strict=True: a connection or query error is
+    raised rather than returning the reduction of the rows read so far.
+    """
+    where, params = range_filter(low, high)
+    pushed, pushed_params, residual = compile_filters(predicates)
+    if pushed:
+        where = f"{where} AND {pushed}"
+        params += pushed_params
+    result = initial
+    batches = batch_processing.stream_users_in_batches(
+        batch_size, row_format, 0, columns, where, params, strict=True)
+    for batch in batches:
+        if residual:
+            batch = [row for row in batch if all(predicate(row) for predicate in residual)]
+        result = reducer(result, mapper(batch))
+    return result
+
+
+def parallel_scan(mapper, reducer, initial, shards=None, workers=None, batch_size=1000,
+                  predicates=(), columns=None, row_format='dict', combine=None):
+    """Map/reduce over user_data with one worker process per key range.
+
+    mapper(batch) turns a batch of rows into a value, reducer(result, value)
+    folds those values within a shard, starting from initial, and
+    combine(result, result) merges the shard results (defaults to reducer).
+    predicates are pushed down exactly as in filter_users. If any shard
+    fails, its error is re-raised here and no partial result is returned.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = shards or workers
+    combine = combine or reducer
+    result = initial
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(scan_shard, low, high, mapper, reducer, initial, batch_size,
+                            tuple(predicates), columns, row_format)
+            for low, high in shard_ranges(shards)
+        ]
+        try:
+            for future in futures:
+                result = combine(result, future.result())
+        except BaseException:
+            # Don't start the shards still queued once the scan has failed
+            for future in futures:
+                future.cancel()
+            raise
+    return result
+
+
+def count_and_sum_ages(batch):
+    """Map a batch of rows to (row count, sum of ages)."""
+    return len(batch), sum(row['age'] for row in batch)
+
+
+def add_pairs(left, right):
+    """Reduce two (count, total) pairs."""
+    return left[0] + right[0], left[1] + right[1]
+
+
+if __name__ == "__main__":
+    count, total = parallel_scan(count_and_sum_ages, add_pairs, (0, 0),
+                                 predicates=[Field('age') > 25], columns=['age'])
+    print(f"Users over 25: {count}")
+    if count:
+        print(f"Their average age: {total / count:.2f}")
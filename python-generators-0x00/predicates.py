@@ -0,0 +1,163 @@
+"""Filters that can be pushed down into the user_data queries.
+
+Comparisons, IN and BETWEEN on user_data columns compile to a parameterized
+WHERE clause, so only matching rows leave MySQL. Anything else can be given
+as a plain Python callable with Where(); it is applied to fetched rows instead.
+
+    >>> where, params, residual = compile_filters([Field('age') > 25])
+    >>> where, params
+    ('age > %s', (25,))
+"""
+from row_formats import USER_COLUMNS, row_value
+
+OPERATORS = ('=', '!=', '<', '<=', '>', '>=')
+
+
+def column_sql(column):
+    """Return the select-list expression for a user_data column."""
+    if column not in USER_COLUMNS:
+        raise ValueError(f"Unknown user_data column: {column!r}")
+    if column == 'user_id':
+        return "BIN_TO_UUID(user_id) AS user_id"
+    return column
+
+
+def placeholder(column):
+    """Return the parameter placeholder for a value compared with column."""
+    return "UUID_TO_BIN(%s)" if column == 'user_id' else "%s"
+
+
+class Field:
+    """A user_data column; comparison operators build pushable predicates."""
+
+    def __init__(self, name):
+        column_sql(name)
+        self.name = name
+
+    def __eq__(self, value):
+        return Comparison(self.name, '=', value)
+
+    def __ne__(self, value):
+        return Comparison(self.name, '!=', value)
+
+    def __lt__(self, value):
+        return Comparison(self.name, '<', value)
+
+    def __le__(self, value):
+        return Comparison(self.name, '<=', value)
+
+    def __gt__(self, value):
+        return Comparison(self.name, '>', value)
+
+    def __ge__(self, value):
+        return Comparison(self.name, '>=', value)
+
+    def isin(self, values):
+        return In(self.name, values)
+
+    def between(self, low, high):
+        return Between(self.name, low, high)
+
+
+class Comparison:
+    """column <op> value."""
+
+    def __init__(self, column, op, value):
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported operator: {op!r}")
+        column_sql(column)
+        self.column = column
+        self.op = op
+        self.value = value
+
+    def to_sql(self):
+        return f"{self.column} {self.op} {placeholder(self.column)}", (self.value,)
+
+    def __call__(self, row):
+        value = row_value(row, self.column)
+        return {
+            '=': value == self.value,
+            '!=': value != self.value,
+            '<': value < self.value,
+            '<=': value <= self.value,
+            '>': value > self.value,
+            '>=': value >= self.value,
+        }[self.op]
+
+
+class In:
+    """column IN (values)."""
+
+    def __init__(self, column, values):
+        column_sql(column)
+        self.column = column
+        self.values = tuple(values)
+
+    def to_sql(self):
+        if not self.values:
+            return "1 = 0", ()
+        marks = ", ".join(placeholder(self.column) for _ in self.values)
+        return f"{self.column} IN ({marks})", self.values
+
+    def __call__(self, row):
+        return row_value(row, self.column) in self.values
+
+
+class Between:
+    """column BETWEEN low AND high, both ends inclusive."""
+
+    def __init__(self, column, low, high):
+        column_sql(column)
+        self.column = column
+        self.low = low
+        self.high = high
+
+    def to_sql(self):
+        mark = placeholder(self.column)
+        return f"{self.column} BETWEEN {mark} AND {mark}", (self.low, self.high)
+
+    def __call__(self, row):
+        return self.low <= row_value(row, self.column) <= self.high
+
+
+class Where:
+    """An arbitrary Python predicate over fetched rows; never pushed down."""
+
+    def __init__(self, func):
+        self.func = func
+
+    def to_sql(self):
+        return None
+
+    def __call__(self, row):
+        return self.func(row)
+
+
+def compile_filters(predicates):
+    """Split predicates into a SQL WHERE clause and a Python residual.
+
+    Returns (where, params, residual): where is the AND of every pushable
+    predicate (or '' if there are none) and residual the list of predicates
+    that must still be applied to the fetched rows.
+    """
+    clauses = []
+    params = ()
+    residual = []
+    for predicate in predicates:
+        compiled = predicate.to_sql()
+        if compiled is None:
+            residual.append(predicate)
+            continue
+        clause, values = compiled
+        clauses.append(clause)
+        params += tuple(values)
+    return " AND ".join(clauses), params, residual
+
+
+def select_query(columns=None, where=""):
+    """Build a SELECT over user_data with the given projection and WHERE clause."""
+    select_list = ", ".join(column_sql(column) for column in (columns or USER_COLUMNS))
+    query = f"SELECT {select_list} FROM user_data"
+    if where:
+        query += f" WHERE {where}"
+    return query + ";"
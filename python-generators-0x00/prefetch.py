@@ -0,0 +1,58 @@
+"""Read-ahead for the batch and page generators.
+
+read_ahead() runs a generator on a background thread and hands its items
+over through a bounded queue, so the next pages are fetched from MySQL
+while the consumer is still processing the current one.
+"""
+import queue
+import threading
+
+
+def read_ahead(iterable, depth=2):
+    """Yield the items of iterable, fetched up to depth items ahead on a thread.
+
+    An exception raised by the source is re-raised in the consumer. When the
+    consumer stops early, the source is closed on its own thread (so e.g. its
+    connection is released) before this generator finishes closing.
+    """
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(kind, value=None):
+        while not stop.is_set():
+            try:
+                buffer.put((kind, value), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put('item', item):
+                    return
+            put('done')
+        except BaseException as e:
+            put('error', e)
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name='read-ahead', daemon=True)
+    thread.start()
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == 'done':
+                return
+            if kind == 'error':
+                raise value
+            yield value
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,99 @@
+"""Row formats for the user_data streamers.
+
+Every streamer takes a row_format keyword:
+
+- 'dict' (default): one dict per row, as returned by cursor(dictionary=True)
+- 'tuple': the raw tuples produced by the cursor, no extra allocation
+- 'namedtuple': UserRow tuples; field names live on the shared class
+- 'record': UserRecord objects with __slots__, mutable but without a __dict__
+"""
+import time
+import tracemalloc
+from collections import namedtuple
+
+USER_COLUMNS = ('user_id', 'name', 'email', 'age')
+
+UserRow = namedtuple('UserRow', USER_COLUMNS)
+
+
+class UserRecord:
+    """A user_data row stored in slots instead of a per-instance dict."""
+    __slots__ = USER_COLUMNS
+
+    def __init__(self, user_id, name, email, age):
+        self.user_id = user_id
+        self.name = name
+        self.email = email
+        self.age = age
+
+    def __repr__(self):
+        return (f"UserRecord(user_id={self.user_id!r}, name={self.name!r}, "
+                f"email={self.email!r}, age={self.age!r})")
+
+
+ROW_FACTORIES = {
+    'dict': None,
+    'tuple': None,
+    'namedtuple': UserRow._make,
+    'record': lambda row: UserRecord(*row),
+}
+
+
+def open_cursor(connection, row_format='dict', **kwargs):
+    """Open a cursor on connection suited to row_format."""
+    if row_format not in ROW_FACTORIES:
+        raise ValueError(f"Unknown row format: {row_format!r}")
+    return connection.cursor(dictionary=(row_format == 'dict'), **kwargs)
+
+
+def convert_rows(rows, row_format='dict'):
+    """Convert a list of fetched rows to row_format."""
+    factory = ROW_FACTORIES[row_format]
+    if factory is None:
+        return rows
+    return [factory(row) for row in rows]
+
+
+def iter_rows(rows, row_format='dict'):
+    """Lazily convert an iterable of fetched rows to row_format."""
+    factory = ROW_FACTORIES[row_format]
+    if factory is None:
+        return rows
+    return map(factory, rows)
+
+
+def row_value(row, column):
+    """Read one column from a row in any of the supported formats."""
+    if isinstance(row, dict):
+        return row[column]
+    if hasattr(row, column):
+        return getattr(row, column)
+    return row[USER_COLUMNS.index(column)]
+
+
+def benchmark_row_formats(rows=100000):
+    """Print bytes allocated and time spent per row for each row format.
+
+    The figures are on top of the tuple the driver already builds per row.
+    """
+    raw = [(f"{i:032x}", f"User {i}", f"user{i}@example.com", i % 120) for i in range(rows)]
+
+    def build(row_format):
+        if row_format == 'dict':
+            return [dict(zip(USER_COLUMNS, row)) for row in raw]
+        return convert_rows(list(raw), row_format)
+
+    for row_format in ROW_FACTORIES:
+        start = time.perf_counter()
+        build(row_format)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        converted = build(row_format)
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del converted
+        print(f"{row_format:>10}: {allocated / rows:6.1f} bytes/row, "
+              f"{elapsed / rows * 1e9:6.0f} ns/row")
+
+if __name__ == "__main__":
+    benchmark_row_formats()
@@ -1,16 +1,19 @@
+import argparse
 import csv
+import os
+import tempfile
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 import mysql.connector
 from mysql.connector import Error
+from db import connect_to_prodev, load_db_config
 
 def connect_db():
     """Connect to the MySQL database server."""
     try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root', 
-            password=' ' 
-        )
+        connection = mysql.connector.connect(**load_db_config())
         if connection.is_connected():
             print("Connected to MySQL server.")
         return connection
@@ -27,71 +30,478 @@ def create_database(connection):
     except Error as e:
         print(f"Error while creating database: {e}")
 
-def connect_to_prodev():
-    """Connect to the ALX_prodev database."""
-    try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root',  
-            password='',  
-            database='ALX_prodev'
-        )
-        if connection.is_connected():
-            print("Connected to ALX_prodev database.")
-        return connection
-    except Error as e:
-        print(f"Error while connecting to ALX_prodev: {e}")
-        return None
-
 def create_table(connection):
-    """Create the user_data table if it does not exist."""
+    """Create the user_data table if it does not exist.
+
+    user_id is stored as BINARY(16) (see UUID_TO_BIN/BIN_TO_UUID); updated_at
+    is a watermark for tailing new and changed rows. Secondary indexes are
+    managed separately by apply_indexes().
+    """
     try:
         cursor = connection.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS user_data (
-                user_id CHAR(36) PRIMARY KEY,
+                user_id BINARY(16) PRIMARY KEY,
                 name VARCHAR(255) NOT NULL,
                 email VARCHAR(255) NOT NULL,
                 age DECIMAL(3, 0) NOT NULL,
-                INDEX (user_id)
+                updated_at TIMESTAMP(6) NOT NULL
+                    DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
             );
         ''')
         print("Table user_data created or already exists.")
     except Error as e:
         print(f"Error while creating table: {e}")
 
+# Secondary indexes of user_data, by name. Any other non-primary index is dropped.
+SECONDARY_INDEXES = {
+    'idx_user_data_age': '(age)',
+    'idx_user_data_email': '(email)',
+    'idx_user_data_updated_at': '(updated_at, user_id)',
+}
+
+def get_column_type(connection, column):
+    """Return the type of a user_data column, e.g. 'binary(16)', or None."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute('''
+            SELECT COLUMN_TYPE FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'user_data'
+                AND COLUMN_NAME = %s;
+        ''', (column,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return row[0].decode() if isinstance(row[0], bytes) else row[0]
+    finally:
+        cursor.close()
+
+def migrate_schema(connection):
+    """Bring a user_data table created by an older seeder up to date.
+
+    Converts a CHAR(36) user_id to BINARY(16) in place and adds the
+    updated_at watermark column.
+    """
+    user_id_type = get_column_type(connection, 'user_id')
+    if user_id_type is None:
+        return
+    cursor = connection.cursor()
+    try:
+        if user_id_type.lower() != 'binary(16)':
+            cursor.execute("ALTER TABLE user_data ADD COLUMN user_id_bin BINARY(16) NULL FIRST;")
+            cursor.execute("UPDATE user_data SET user_id_bin = UUID_TO_BIN(user_id);")
+            cursor.execute('''
+                ALTER TABLE user_data
+                    DROP PRIMARY KEY,
+                    DROP COLUMN user_id,
+                    CHANGE COLUMN user_id_bin user_id BINARY(16) NOT NULL FIRST,
+                    ADD PRIMARY KEY (user_id);
+            ''')
+            connection.commit()
+            print("Migrated user_data.user_id to BINARY(16).")
+        if get_column_type(connection, 'updated_at') is None:
+            cursor.execute('''
+                ALTER TABLE user_data ADD COLUMN updated_at TIMESTAMP(6) NOT NULL
+                    DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+            ''')
+            print("Added user_data.updated_at.")
+    finally:
+        cursor.close()
+
+def get_secondary_indexes(connection):
+    """Return the names of the non-primary indexes on user_data."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute('''
+            SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'user_data'
+                AND INDEX_NAME <> 'PRIMARY';
+        ''')
+        return {row[0] for row in cursor}
+    finally:
+        cursor.close()
+
+def alter_indexes(connection, drop=(), add=()):
+    """Drop and add named user_data indexes in a single ALTER TABLE."""
+    clauses = [f"DROP INDEX `{name}`" for name in sorted(drop)]
+    clauses += [f"ADD INDEX `{name}` {SECONDARY_INDEXES[name]}" for name in sorted(add)]
+    if not clauses:
+        return
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"ALTER TABLE user_data {', '.join(clauses)};")
+    finally:
+        cursor.close()
+
+def drop_secondary_indexes(connection):
+    """Drop every secondary index, e.g. ahead of a bulk load."""
+    alter_indexes(connection, drop=get_secondary_indexes(connection))
+
+def apply_indexes(connection):
+    """Bring the user_data indexes in line with SECONDARY_INDEXES."""
+    existing = get_secondary_indexes(connection)
+    alter_indexes(
+        connection,
+        drop=existing - SECONDARY_INDEXES.keys(),
+        add=SECONDARY_INDEXES.keys() - existing,
+    )
+
+def get_index_sizes(connection):
+    """Return {index name: size in bytes} for user_data from InnoDB statistics."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("ANALYZE TABLE user_data;")
+        cursor.fetchall()
+        cursor.execute('''
+            SELECT index_name, stat_value * @@innodb_page_size
+            FROM mysql.innodb_index_stats
+            WHERE database_name = DATABASE() AND table_name = 'user_data'
+                AND stat_name = 'size';
+        ''')
+        return {name: int(size) for name, size in cursor}
+    finally:
+        cursor.close()
+
+def report_index_sizes(before, after):
+    """Print index sizes before and after seeding."""
+    for name in sorted(before.keys() | after.keys()):
+        print(f"Index {name}: {before.get(name, 0) / 1024:.0f} KiB -> {after.get(name, 0) / 1024:.0f} KiB")
+
+INSERT_QUERY = '''
+    INSERT INTO user_data (user_id, name, email, age)
+    VALUES (UUID_TO_BIN(%s), %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        name = VALUES(name),
+        email = VALUES(email),
+        age = VALUES(age);
+'''
+
 def insert_data(connection, data):
     """Insert data into the user_data table."""
     try:
         cursor = connection.cursor()
-        insert_query = '''
-            INSERT INTO user_data (user_id, name, email, age)
-            VALUES (%s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-                name = VALUES(name),
-                email = VALUES(email),
-                age = VALUES(age);
-        '''
-        cursor.executemany(insert_query, data)
+        cursor.executemany(INSERT_QUERY, data)
         connection.commit()
         print(f"Inserted {cursor.rowcount} rows into user_data table.")
     except Error as e:
         print(f"Error while inserting data: {e}")
 
+USER_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, 'user_data.ALX_prodev')
+
+def make_user_id(email):
+    """Derive a stable user_id from an email address."""
+    return str(uuid.uuid5(USER_ID_NAMESPACE, email.strip().lower()))
+
+def make_row(row, keyed=False):
+    """Build a user_data tuple from a parsed CSV row.
+
+    With keyed=True the user_id is derived from the email, so seeding the
+    same file twice updates rows in place instead of duplicating them.
+    """
+    user_id = make_user_id(row['email']) if keyed else str(uuid.uuid4())
+    return (user_id, row['name'], row['email'], row['age'])
+
+def stream_csv(file_path, keyed=False):
+    """Yield user rows from a CSV file one at a time."""
+    with open(file_path, 'r', newline='') as file:
+        csv_reader = csv.DictReader(file)
+        for row in csv_reader:
+            yield make_row(row, keyed)
+
+def partition_csv(file_path, partitions):
+    """Split the data rows of a CSV file into byte ranges on line boundaries.
+
+    Returns a list of (start, end) offsets; every line starting inside a range
+    belongs to it. Fields must not contain embedded newlines.
+    """
+    with open(file_path, 'rb') as file:
+        file.readline()
+        data_start = file.tell()
+        file_size = os.fstat(file.fileno()).st_size
+        step = max((file_size - data_start) // max(partitions, 1), 1)
+        bounds = [data_start]
+        for number in range(1, partitions):
+            file.seek(data_start + number * step)
+            file.readline()
+            position = file.tell()
+            if position >= file_size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+        bounds.append(file_size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+def read_lines_until(file, end):
+    """Yield decoded lines from a binary file while they start before end."""
+    while file.tell() < end:
+        line = file.readline()
+        if not line:
+            break
+        yield line.decode('utf-8')
+
+def stream_csv_range(file_path, start, end, keyed=False):
+    """Yield user rows from the lines starting in the byte range [start, end)."""
+    with open(file_path, 'rb') as file:
+        fieldnames = next(csv.reader([file.readline().decode('utf-8-sig')]))
+        file.seek(start)
+        csv_reader = csv.DictReader(read_lines_until(file, end), fieldnames=fieldnames)
+        for row in csv_reader:
+            yield make_row(row, keyed)
+
 def read_csv(file_path):
     """Read user data from a CSV file."""
     data = []
     try:
-        with open(file_path, 'r') as file:
-            csv_reader = csv.DictReader(file)
-            for row in csv_reader:
-                data.append((str(uuid.uuid4()), row['name'], row['email'], row['age']))
+        data = list(stream_csv(file_path))
         print(f"Read {len(data)} rows from CSV file.")
     except Exception as e:
         print(f"Error reading CSV file: {e}")
     return data
 
-def main():
+def chunked(rows, chunk_size):
+    """Group an iterable of rows into lists of at most chunk_size rows."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        yield chunk
+
+def insert_chunks(connection, rows, chunk_size=1000):
+    """Insert rows in fixed-size chunks, yielding the size of each committed chunk.
+
+    Only one chunk is held in memory at a time, so rows can be a generator
+    such as stream_csv() over a file of any size. If a chunk fails, the rows
+    yielded so far are already committed.
+    """
+    cursor = connection.cursor()
+    try:
+        for number, chunk in enumerate(chunked(rows, chunk_size), start=1):
+            start = time.perf_counter()
+            cursor.executemany(INSERT_QUERY, chunk)
+            connection.commit()
+            elapsed = time.perf_counter() - start
+            rate = len(chunk) / elapsed if elapsed > 0 else float('inf')
+            print(f"Chunk {number}: inserted {len(chunk)} rows in {elapsed:.2f}s ({rate:.0f} rows/sec).")
+            yield len(chunk)
+    finally:
+        cursor.close()
+
+def insert_data_in_chunks(connection, rows, chunk_size=1000):
+    """Insert rows in fixed-size chunks, committing after each chunk.
+
+    Returns the number of rows sent.
+    """
+    return sum(insert_chunks(connection, rows, chunk_size))
+
+BULK_LOAD_THRESHOLD = 100000
+
+def count_csv_rows(file_path):
+    """Count the data rows in a CSV file without parsing it."""
+    lines = 0
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            lines += block.count(b'\n')
+    return max(lines - 1, 0)
+
+def write_staging_file(rows, file_path):
+    """Write rows, with their pre-generated UUIDs, to a staging CSV file."""
+    count = 0
+    with open(file_path, 'w', newline='') as file:
+        csv_writer = csv.writer(file, lineterminator='\n')
+        for row in rows:
+            csv_writer.writerow(row)
+            count += 1
+    return count
+
+def bulk_load_data(connection, rows):
+    """Bulk-load rows into user_data through LOAD DATA LOCAL INFILE.
+
+    The rows are written to a staging file, loaded into a temporary staging
+    table and merged into user_data with one INSERT ... SELECT. The connection
+    must be opened with allow_local_infile=True. Returns the number of rows loaded.
+    """
+    fd, staging_path = tempfile.mkstemp(prefix='user_data_', suffix='.csv')
+    os.close(fd)
+    cursor = connection.cursor()
+    try:
+        start = time.perf_counter()
+        count = write_staging_file(rows, staging_path)
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS user_data_staging;")
+        cursor.execute("CREATE TEMPORARY TABLE user_data_staging LIKE user_data;")
+        cursor.execute('''
+            LOAD DATA LOCAL INFILE %s
+            INTO TABLE user_data_staging
+            FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+            LINES TERMINATED BY '\\n'
+            (@user_id, name, email, age)
+            SET user_id = UUID_TO_BIN(@user_id);
+        ''', (staging_path,))
+        cursor.execute('''
+            INSERT INTO user_data (user_id, name, email, age)
+            SELECT user_id, name, email, age FROM user_data_staging
+            ON DUPLICATE KEY UPDATE
+                name = VALUES(name),
+                email = VALUES(email),
+                age = VALUES(age);
+        ''')
+        connection.commit()
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else float('inf')
+        print(f"Bulk-loaded {count} rows in {elapsed:.2f}s ({rate:.0f} rows/sec).")
+        return count
+    finally:
+        # Drop the staging table even if the load or merge failed
+        try:
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS user_data_staging;")
+        except Error:
+            pass
+        cursor.close()
+        os.remove(staging_path)
+
+SYNC_STAGING_QUERY = '''
+    INSERT INTO user_data_sync (user_id, name, email, age)
+    VALUES (UUID_TO_BIN(%s), %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        name = VALUES(name),
+        email = VALUES(email),
+        age = VALUES(age);
+'''
+
+# Staged rows in a key range that are missing from user_data or differ from it
+SYNC_CHANGED_ROWS = '''
+    FROM user_data_sync s
+    LEFT JOIN user_data u ON u.user_id = s.user_id
+    WHERE {key_range}
+        AND NOT (u.name <=> s.name AND u.email <=> s.email AND u.age <=> s.age)
+'''
+
+def stage_sync_rows(connection, file_path, chunk_size=1000):
+    """Load a CSV file, keyed by email, into the user_data_sync temporary table.
+
+    Returns the number of distinct staged rows.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS user_data_sync;")
+        cursor.execute('''
+            CREATE TEMPORARY TABLE user_data_sync (
+                user_id BINARY(16) PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                email VARCHAR(255) NOT NULL,
+                age DECIMAL(3, 0) NOT NULL
+            );
+        ''')
+        for chunk in chunked(stream_csv(file_path, keyed=True), chunk_size):
+            cursor.executemany(SYNC_STAGING_QUERY, chunk)
+            connection.commit()
+        cursor.execute("SELECT COUNT(*) FROM user_data_sync;")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+def sync_data(connection, file_path, chunk_size=1000):
+    """Incrementally sync a CSV file into user_data.
+
+    Rows are keyed by email and staged in a temporary table, then merged in
+    primary-key batches of chunk_size; each batch writes only the staged rows
+    that are new or differ from what is stored. Memory use does not grow with
+    the file or the table. Returns (rows written, rows skipped as unchanged).
+    """
+    staged = stage_sync_rows(connection, file_path, chunk_size)
+    written = 0
+    low = None
+    cursor = connection.cursor()
+    try:
+        while True:
+            # The last staged key of this batch, or None if it is the final one
+            after, after_params = ("WHERE user_id > %s", (low,)) if low is not None else ("", ())
+            cursor.execute(
+                f"SELECT user_id FROM user_data_sync {after} ORDER BY user_id LIMIT 1 OFFSET %s;",
+                after_params + (chunk_size - 1,),
+            )
+            row = cursor.fetchone()
+            high = row[0] if row else None
+
+            clauses, params = [], []
+            if low is not None:
+                clauses.append("s.user_id > %s")
+                params.append(low)
+            if high is not None:
+                clauses.append("s.user_id <= %s")
+                params.append(high)
+            changed = SYNC_CHANGED_ROWS.format(key_range=" AND ".join(clauses) or "TRUE")
+
+            cursor.execute(f"SELECT COUNT(*) {changed};", params)
+            count = cursor.fetchone()[0]
+            if count:
+                cursor.execute(f'''
+                    INSERT INTO user_data (user_id, name, email, age)
+                    SELECT s.user_id, s.name, s.email, s.age {changed}
+                    ON DUPLICATE KEY UPDATE
+                        name = VALUES(name),
+                        email = VALUES(email),
+                        age = VALUES(age);
+                ''', params)
+            connection.commit()
+            written += count
+            if high is None:
+                break
+            low = high
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS user_data_sync;")
+    finally:
+        cursor.close()
+    return written, staged - written
+
+def seed_partition(file_path, start, end, chunk_size=1000, keyed=False):
+    """Seed one byte range of the CSV file over its own connection.
+
+    Runs inside a worker process. Returns (rows inserted, error message or None);
+    on error the count still includes the chunks committed before it.
+    """
+    connection = connect_to_prodev()
+    if not connection:
+        return 0, "could not connect to ALX_prodev"
+    total = 0
+    try:
+        rows = stream_csv_range(file_path, start, end, keyed)
+        for committed in insert_chunks(connection, rows, chunk_size):
+            total += committed
+        return total, None
+    except Exception as e:
+        return total, str(e)
+    finally:
+        connection.close()
+
+def seed_in_parallel(file_path, workers, chunk_size=1000, keyed=False):
+    """Seed user_data from CSV partitions in a pool of worker processes.
+
+    Returns (total rows inserted, list of per-partition error messages).
+    """
+    partitions = partition_csv(file_path, workers)
+    total = 0
+    errors = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(seed_partition, file_path, start, end, chunk_size, keyed)
+            for start, end in partitions
+        ]
+        for number, future in enumerate(futures, start=1):
+            try:
+                rows, error = future.result()
+            except Exception as e:
+                rows, error = 0, str(e)
+            total += rows
+            if error:
+                errors.append(f"partition {number}: {error}")
+    return total, errors
+
+def main(file_path='user_data.csv', chunk_size=1000, bulk_load_threshold=BULK_LOAD_THRESHOLD, workers=1,
+         keyed=False, sync=False):
+    if sync and workers > 1:
+        print("Error: --sync runs over a single connection and cannot be combined with --workers.")
+        return
+
     # Step 1: Connect to the MySQL server
     connection = connect_db()
     if not connection:
@@ -101,22 +511,79 @@ def main():
     create_database(connection)
     connection.close()
 
-    # Step 3: Connect to the ALX_prodev database
-    prodev_connection = connect_to_prodev()
+    # Step 3: Connect to the ALX_prodev database, choosing the load backend by size.
+    # A sync writes only the changed rows, so it never bulk-loads.
+    try:
+        bulk_load = not sync and count_csv_rows(file_path) > bulk_load_threshold
+    except OSError as e:
+        print(f"Error reading CSV file: {e}")
+        return
+    prodev_connection = connect_to_prodev(allow_local_infile=bulk_load)
     if not prodev_connection:
         return
 
-    # Step 4: Create the user_data table
+    # Step 4: Create or migrate the user_data table
     create_table(prodev_connection)
+    try:
+        migrate_schema(prodev_connection)
+    except Error as e:
+        print(f"Error while migrating schema: {e}")
+        prodev_connection.close()
+        return
+
+    # The size report needs read access to the mysql schema; without it, skip only the report
+    try:
+        index_sizes_before = get_index_sizes(prodev_connection)
+    except Error as e:
+        print(f"Skipping index size report: {e}")
+        index_sizes_before = None
 
-    # Step 5: Read data from the CSV file
-    data = read_csv('user_data.csv')
+    # Step 5: Stream the CSV file into the database, building indexes afterwards
+    try:
+        # A full load rebuilds the indexes once afterwards, which is cheaper
+        # than maintaining them row by row; a sync (never bulk, never parallel)
+        # keeps them, since it writes only the diff.
+        if bulk_load or workers > 1:
+            drop_secondary_indexes(prodev_connection)
+        if sync:
+            total, skipped = sync_data(prodev_connection, file_path, chunk_size)
+            print(f"Skipped {skipped} unchanged rows.")
+        elif workers > 1:
+            total, errors = seed_in_parallel(file_path, workers, chunk_size, keyed)
+            for error in errors:
+                print(f"Error while seeding {error}")
+        elif bulk_load:
+            total = bulk_load_data(prodev_connection, stream_csv(file_path, keyed))
+        else:
+            total = insert_data_in_chunks(prodev_connection, stream_csv(file_path, keyed), chunk_size)
+        print(f"Inserted {total} rows into user_data table.")
+    except Exception as e:
+        print(f"Error while seeding data: {e}")
 
-    # Step 6: Insert data into the database
-    insert_data(prodev_connection, data)
+    # Step 6: Build the declared secondary indexes
+    try:
+        apply_indexes(prodev_connection)
+    except Error as e:
+        print(f"Error while building indexes: {e}")
+    if index_sizes_before is not None:
+        try:
+            report_index_sizes(index_sizes_before, get_index_sizes(prodev_connection))
+        except Error as e:
+            print(f"Skipping index size report: {e}")
 
     # Step 7: Close the database connection
     prodev_connection.close()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Seed the ALX_prodev user_data table.")
+    parser.add_argument("file_path", nargs="?", default="user_data.csv")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--keyed", action="store_true",
+                        help="derive user_id from the email so re-seeding is idempotent")
+    parser.add_argument("--sync", action="store_true",
+                        help="keyed incremental sync that skips unchanged rows "
+                             "(single connection; cannot be combined with --workers)")
+    args = parser.parse_args()
+    main(args.file_path, chunk_size=args.chunk_size, workers=args.workers,
+         keyed=args.keyed, sync=args.sync)
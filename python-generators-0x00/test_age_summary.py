@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the AgeSummary reducer in the age_summary module.
+
+Each test runs with NumPy, if it is installed, and with the built-in fallback.
+"""
+import unittest
+from array import array
+from decimal import Decimal
+from unittest.mock import patch
+import age_summary
+
+AGES = [-999, -5, 0, 7, 7, 30, 999]
+
+
+class TestAgeSummary(unittest.TestCase):
+    """
+    Test case for AgeSummary over the full DECIMAL(3,0) range of ages.
+    """
+
+    def backends(self):
+        """Yield once per available backend, with age_summary.np set to it."""
+        for np in {age_summary.np, None}:
+            with self.subTest(numpy=np is not None), patch.object(age_summary, 'np', np):
+                yield
+
+    def test_negative_and_extreme_ages(self):
+        """Ages from -999 to 999 are counted, summed and binned exactly."""
+        for _ in self.backends():
+            summary = age_summary.summarize_ages([array('h', AGES[:3]), array('h', AGES[3:])])
+            self.assertEqual(summary.count, 7)
+            self.assertEqual(summary.mean(), Decimal(39) / 7)
+            self.assertEqual(summary.age_counts(),
+                             [(-999, 1), (-5, 1), (0, 1), (7, 2), (30, 1), (999, 1)])
+            self.assertEqual(summary.histogram(10),
+                             {-1000: 1, -10: 1, 0: 3, 30: 1, 990: 1})
+            self.assertEqual(summary.quantile(0), -999)
+            self.assertEqual(summary.quantile(0.5), 7)
+            self.assertEqual(summary.quantile(1), 999)
+
+    def test_merge(self):
+        """Merged summaries equal one summary over all the batches."""
+        for _ in self.backends():
+            left = age_summary.summarize_ages([array('h', AGES[:4])])
+            right = age_summary.summarize_ages([array('h', AGES[4:])])
+            whole = age_summary.summarize_ages([array('h', AGES)])
+            merged = left.merge(right)
+            self.assertEqual((merged.count, merged.total), (whole.count, whole.total))
+            self.assertEqual(merged.age_counts(), whole.age_counts())
+
+    def test_empty(self):
+        """An empty summary has no mean or quantile."""
+        for _ in self.backends():
+            summary = age_summary.summarize_ages([array('h')])
+            self.assertIsNone(summary.mean())
+            self.assertIsNone(summary.quantile(0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
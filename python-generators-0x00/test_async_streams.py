@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the async_streams module.
+
+aiomysql.create_pool is replaced by a pool over a local stand-in database
+whose cursors yield to the event loop on every fetch, like a real socket read
+would.
+"""
+import asyncio
+import unittest
+from contextlib import aclosing
+from unittest.mock import patch
+import async_streams
+
+USERS = [
+    {'user_id': f'00000000-0000-0000-0000-{number:012d}', 'name': f'User {number}',
+     'email': f'user{number}@example.com', 'age': 20 + number}
+    for number in range(10)
+]
+
+
+class FakeCursor:
+    """A server-side cursor over the stand-in user_data rows."""
+
+    def __init__(self, database, dictionary):
+        self.database = database
+        self.dictionary = dictionary
+        self.rows = []
+
+    async def execute(self, query, params=None):
+        rows = USERS
+        if params:
+            page_size, offset = params
+            rows = rows[offset:offset + page_size]
+        if query.startswith("SELECT age"):
+            self.rows = [(user['age'],) for user in rows]
+        elif self.dictionary:
+            self.rows = [dict(user) for user in rows]
+        else:
+            self.rows = [tuple(user.values()) for user in rows]
+
+    async def fetchone(self):
+        await asyncio.sleep(0)
+        self.database.log.append(self.database.name)
+        return self.rows.pop(0) if self.rows else None
+
+    async def fetchmany(self, size):
+        await asyncio.sleep(0)
+        self.database.log.append(self.database.name)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    async def fetchall(self):
+        return await self.fetchmany(len(self.rows))
+
+    def __await__(self):
+        async def cursor():
+            return self
+        return cursor().__await__()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeConnection:
+    """A stand-in aiomysql connection that records every fetch."""
+
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+        self.closed = False
+
+    def cursor(self, cursor_class=None):
+        dictionary = cursor_class in (async_streams.aiomysql.SSDictCursor,
+                                      async_streams.aiomysql.DictCursor)
+        return FakeCursor(self, dictionary)
+
+    def close(self):
+        self.closed = True
+
+
+class FakePool:
+    """A stand-in aiomysql pool that reuses released, still-open connections."""
+
+    def __init__(self, connect):
+        self.connect = connect
+        self.free = []
+        self.closed = False
+
+    async def acquire(self):
+        return self.free.pop() if self.free else await self.connect()
+
+    def release(self, connection):
+        if not connection.closed:
+            self.free.append(connection)
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+class TestAsyncStreams(unittest.IsolatedAsyncioTestCase):
+    """
+    Test case for the async generators over a stand-in database.
+    """
+
+    def setUp(self):
+        """Patch aiomysql.create_pool to pool recorded FakeConnections."""
+        self.log = []
+        self.connections = []
+        self.pools = []
+
+        async def connect():
+            connection = FakeConnection(len(self.connections), self.log)
+            self.connections.append(connection)
+            return connection
+
+        async def create_pool(**kwargs):
+            self.pools.append(FakePool(connect))
+            return self.pools[-1]
+
+        patcher = patch.object(async_streams.aiomysql, 'create_pool', side_effect=create_pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        """Close the pool of the test's event loop."""
+        await async_streams.close_pool()
+
+    async def test_stream_users_yields_every_row(self):
+        """stream_users yields all rows, then returns its connection to the pool."""
+        users = [user async for user in async_streams.stream_users()]
+        self.assertEqual(users, USERS)
+        self.assertFalse(self.connections[0].closed)
+        self.assertEqual(self.pools[0].free, self.connections)
+
+    async def test_batches_and_pages(self):
+        """Batches and pages cover the table in order over one pooled connection."""
+        batches = [batch async for batch in async_streams.stream_users_in_batches(4)]
+        pages = [page async for page in async_streams.lazy_paginate(4)]
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+        self.assertEqual(pages, batches)
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(len(self.pools), 1)
+
+    async def test_concurrent_scans_interleave(self):
+        """Two scans gathered on one loop take turns fetching."""
+        average_age, users = await asyncio.gather(
+            async_streams.calculate_average_age(), async_streams.count_users())
+        self.assertEqual(average_age, sum(user['age'] for user in USERS) / len(USERS))
+        self.assertEqual(users, len(USERS))
+        # The age scan was still fetching after the page scan had started
+        first_page_fetch = self.log.index(1)
+        self.assertIn(0, self.log[first_page_fetch:])
+
+    async def test_abandoned_stream_closes_connection(self):
+        """Stopping an async for early closes the connection without draining."""
+        async with aclosing(async_streams.stream_users()) as users:
+            async for user in users:
+                break
+        self.assertEqual(user, USERS[0])
+        self.assertTrue(self.connections[0].closed)
+        self.assertEqual(len(self.log), 1)
+        self.assertEqual(self.pools[0].free, [])
+
+        # The next scan gets a fresh connection rather than the unread one
+        self.assertEqual([user async for user in async_streams.stream_users()], USERS)
+        self.assertEqual(len(self.connections), 2)
+
+    async def test_close_pool(self):
+        """close_pool closes the loop's pool; the next scan opens a new one."""
+        [user async for user in async_streams.stream_users()]
+        await async_streams.close_pool()
+        self.assertTrue(self.pools[0].closed)
+        [user async for user in async_streams.stream_users()]
+        self.assertEqual(len(self.pools), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Round-trip tests for the columnar_export module.
+
+stream_users_in_batches is replaced by fake batches, so no database is needed.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pytest
+from mysql.connector import Error
+
+pytest.importorskip('pyarrow')
+
+import columnar_export  # noqa: E402
+
+BATCHES = [
+    [('00000000-0000-0000-0000-000000000001', 'Alice', 'alice@example.com', 30),
+     ('00000000-0000-0000-0000-000000000002', 'Bob', 'bob@example.com', 20)],
+    [('00000000-0000-0000-0000-000000000003', 'Carol', 'carol@example.com', 40)],
+]
+
+
+class TestColumnarExport(unittest.TestCase):
+    """
+    Test case for exporting fake batches and reading the snapshot back.
+    """
+
+    def export(self, file_format):
+        """Export BATCHES to a temporary file and open it as a snapshot."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        path = os.path.join(directory.name, f'user_data.{file_format}')
+        with patch.object(columnar_export.batch_processing, 'stream_users_in_batches',
+                          return_value=iter(BATCHES)):
+            rows = columnar_export.export_user_data(path, file_format=file_format)
+        self.assertEqual(rows, 3)
+        return columnar_export.open_snapshot(path)
+
+    def test_arrow_round_trip(self):
+        """An Arrow IPC snapshot holds the exported rows and their average age."""
+        snapshot = self.export('arrow')
+        self.assertEqual(snapshot.schema, columnar_export.USER_SCHEMA)
+        self.assertEqual(snapshot['name'].to_pylist(), ['Alice', 'Bob', 'Carol'])
+        self.assertEqual(columnar_export.snapshot_average_age(snapshot), 30)
+
+    def test_parquet_round_trip(self):
+        """A Parquet snapshot gives the same average and over-25 batches."""
+        snapshot = self.export('parquet')
+        self.assertEqual(columnar_export.snapshot_average_age(snapshot), 30)
+        batches = list(columnar_export.snapshot_batch_processing(snapshot, 1))
+        self.assertEqual([[row['name'] for row in batch] for batch in batches],
+                         [['Alice'], ['Carol']])
+
+    def test_failed_scan_keeps_previous_snapshot(self):
+        """A scan error is raised and the old snapshot is left in place."""
+        snapshot = self.export('arrow')
+        path = os.path.join(self.directory, 'user_data.arrow')
+
+        def failing_batches(*args, **kwargs):
+            yield BATCHES[0]
+            raise Error("Lost connection to MySQL server during query")
+
+        with patch.object(columnar_export.batch_processing, 'stream_users_in_batches',
+                          side_effect=failing_batches):
+            with self.assertRaises(Error):
+                columnar_export.export_user_data(path)
+        self.assertEqual(os.listdir(self.directory), ['user_data.arrow'])
+        self.assertEqual(columnar_export.open_snapshot(path), snapshot)
+
+    def test_negative_age(self):
+        """Ages below zero, which DECIMAL(3,0) allows, are kept."""
+        record_batch = columnar_export.to_record_batch(
+            [('00000000-0000-0000-0000-000000000004', 'Dan', 'dan@example.com', -999)])
+        self.assertEqual(record_batch['age'].to_pylist(), [-999])
+
+    def test_rejects_unknown_format(self):
+        """Only arrow and parquet are accepted."""
+        with self.assertRaises(ValueError):
+            columnar_export.export_user_data('user_data.csv', file_format='csv')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pooled connection layer in the db module.
+
+A real MySQLConnectionPool hands out FakeConnections, which behave like the
+C extension's connection when a result is left unread: they can be neither
+reset nor health-checked until their socket is dropped.
+"""
+import importlib
+import unittest
+from unittest.mock import patch
+from mysql.connector.connection import MySQLConnection
+from mysql.connector.errors import InternalError, OperationalError
+from mysql.connector.pooling import MySQLConnectionPool
+import db
+
+stream_users = importlib.import_module('0-stream_users')
+
+USERS = [{'user_id': str(number), 'name': f'User {number}',
+          'email': f'user{number}@example.com', 'age': 20 + number}
+         for number in range(5)]
+
+
+class FakeCursor:
+    """An unbuffered cursor: the result stays unread until it is exhausted."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, params=None):
+        self.connection.unread = True
+
+    def __iter__(self):
+        for user in USERS:
+            yield dict(user)
+        self.connection.unread = False
+
+
+class FakeConnection(MySQLConnection):
+    """A MySQLConnection with the network side replaced by flags."""
+
+    def __init__(self):
+        super().__init__()
+        self.connected = True
+        self.unread = False
+        self.reconnects = 0
+
+    @property
+    def unread_result(self):
+        return self.unread
+
+    @unread_result.setter
+    def unread_result(self, value):
+        pass
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def config(self, **kwargs):
+        pass
+
+    def is_connected(self):
+        if self.unread:
+            raise InternalError("Unread result found")
+        return self.connected
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        if not self.is_connected():
+            raise InternalError("Connection not available")
+
+    def reset_session(self, user_variables=None, session_variables=None):
+        if not self.is_connected():
+            raise OperationalError("MySQL Connection not available.")
+
+    def close(self):
+        self.connected = False
+        self.unread = False
+
+    disconnect = close
+
+    def reconnect(self, attempts=1, delay=0):
+        self.connected = True
+        self.reconnects += 1
+
+
+class TestReleaseConnection(unittest.TestCase):
+    """
+    Test case for returning streamed connections to the pool.
+    """
+
+    def setUp(self):
+        """Build a one-connection pool and route connect_to_prodev to it."""
+        self.cnx = FakeConnection()
+        self.pool = MySQLConnectionPool(pool_name='test_db', pool_size=1)
+        self.pool.set_config(database='ALX_prodev')
+        self.pool.add_connection(self.cnx)
+        # The first checkout stamps the pool's config version on the connection
+        self.pool.get_connection().close()
+        self.cnx.reconnects = 0
+        patcher = patch.object(db, 'get_pool', return_value=self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_finished_stream_keeps_connection(self):
+        """A fully read stream hands its connection back still connected."""
+        for _ in range(3):
+            self.assertEqual(list(stream_users.stream_users()), USERS)
+        self.assertEqual(self.cnx.reconnects, 0)
+
+    def test_abandoned_streams_do_not_drain_pool(self):
+        """Breaking out of a stream leaves a usable connection in the pool."""
+        for _ in range(6):
+            users = stream_users.stream_users()
+            self.assertEqual(next(users), USERS[0])
+            users.close()
+            self.assertFalse(self.cnx.unread)
+
+        # Every checkout came from the pool, reconnecting the dropped socket
+        with patch.object(db.mysql.connector, 'connect') as connect:
+            self.assertEqual(list(stream_users.stream_users()), USERS)
+        connect.assert_not_called()
+        self.assertEqual(self.cnx.reconnects, 6)
+
+
+class TestGetPool(unittest.TestCase):
+    """
+    Test case for sizing the process-wide pool.
+    """
+
+    def setUp(self):
+        """Forget any pool created by an earlier test."""
+        patcher = patch.object(db, 'pool', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def pool_size(self, parent):
+        """Return the size get_pool() asks for with the given parent process."""
+        with patch.object(db, 'MySQLConnectionPool') as pool_class, \
+                patch.object(db.multiprocessing, 'parent_process', return_value=parent):
+            db.get_pool()
+        return pool_class.call_args.kwargs['pool_size']
+
+    def test_main_process_uses_pool_size(self):
+        """The main process gets POOL_SIZE connections."""
+        self.assertEqual(self.pool_size(None), db.POOL_SIZE)
+
+    def test_worker_process_gets_one_connection(self):
+        """A worker process gets a pool of one."""
+        self.assertEqual(self.pool_size(object()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
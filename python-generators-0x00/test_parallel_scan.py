@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the parallel_scan module.
+
+The batch source's connection is replaced by a stand-in whose cursor serves
+fixed rows or fails part-way, and the process pool by a thread pool so the
+patches reach the shards.
+"""
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from mysql.connector import Error
+import parallel_scan
+
+ROWS = [{'age': age} for age in (20, 30, 40, 50)]
+
+
+class FakeCursor:
+    """A cursor over ROWS that raises after fail_after batches, if set."""
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.rows = list(ROWS)
+
+    def fetchmany(self, size):
+        if self.fail_after is not None:
+            if not self.fail_after:
+                raise Error("Lost connection to MySQL server during query")
+            self.fail_after -= 1
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+class FakeConnection:
+    """A stand-in connection handing out FakeCursors."""
+
+    unread_result = False
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self.fail_after)
+
+    def close(self):
+        self.closed = True
+
+
+class TestParallelScan(unittest.TestCase):
+    """
+    Test case for shard scans and for surfacing their errors.
+    """
+
+    def connect(self, connection):
+        """Have the batch source use connection (or fail to connect if None)."""
+        patcher = patch.object(parallel_scan.batch_processing, 'connect_to_prodev',
+                               return_value=connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_scan_shard_reduces_every_batch(self):
+        """A complete shard scan folds every batch into the result."""
+        connection = FakeConnection()
+        self.connect(connection)
+        result = parallel_scan.scan_shard('0' * 32, None, parallel_scan.count_and_sum_ages,
+                                          parallel_scan.add_pairs, (0, 0), batch_size=3)
+        self.assertEqual(result, (4, 140))
+        self.assertTrue(connection.closed)
+
+    def test_scan_shard_raises_mid_scan_error(self):
+        """An error after some batches is raised, not a partial total."""
+        connection = FakeConnection(fail_after=1)
+        self.connect(connection)
+        with self.assertRaises(Error):
+            parallel_scan.scan_shard('0' * 32, None, parallel_scan.count_and_sum_ages,
+                                     parallel_scan.add_pairs, (0, 0), batch_size=2)
+        self.assertTrue(connection.closed)
+
+    def test_scan_shard_raises_connection_failure(self):
+        """A shard that cannot connect raises instead of returning initial."""
+        self.connect(None)
+        with self.assertRaises(Error):
+            parallel_scan.scan_shard('0' * 32, None, parallel_scan.count_and_sum_ages,
+                                     parallel_scan.add_pairs, (0, 0))
+
+    def test_parallel_scan_surfaces_shard_error(self):
+        """parallel_scan re-raises a failed shard's error."""
+        self.connect(FakeConnection(fail_after=0))
+        with patch.object(parallel_scan, 'ProcessPoolExecutor', ThreadPoolExecutor):
+            with self.assertRaises(Error):
+                parallel_scan.parallel_scan(parallel_scan.count_and_sum_ages,
+                                            parallel_scan.add_pairs, (0, 0),
+                                            shards=4, workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
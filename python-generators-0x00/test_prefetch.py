@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the read_ahead generator in the prefetch module.
+"""
+import threading
+import unittest
+from prefetch import read_ahead
+
+
+class TestReadAhead(unittest.TestCase):
+    """
+    Test case for read_ahead: ordering, error propagation and early close.
+    """
+
+    def test_yields_items_in_order(self):
+        """All items of the source come through, in order."""
+        self.assertEqual(list(read_ahead(range(10), depth=3)), list(range(10)))
+
+    def test_rejects_depth_below_one(self):
+        """A depth of 0 is refused before any thread is started."""
+        with self.assertRaises(ValueError):
+            next(read_ahead(range(3), depth=0))
+
+    def test_reraises_source_exception(self):
+        """An exception raised by the source reaches the consumer."""
+        def source():
+            yield 1
+            raise RuntimeError("fetch failed")
+
+        batches = read_ahead(source())
+        self.assertEqual(next(batches), 1)
+        with self.assertRaises(RuntimeError) as context:
+            next(batches)
+        self.assertEqual(str(context.exception), "fetch failed")
+
+    def test_early_close_releases_source_on_worker_thread(self):
+        """Closing early closes the source on the worker, then joins it."""
+        released = []
+
+        def source():
+            try:
+                for number in range(1000):
+                    yield number
+            finally:
+                released.append(threading.current_thread())
+
+        batches = read_ahead(source(), depth=2)
+        self.assertEqual(next(batches), 0)
+        batches.close()
+
+        self.assertEqual(len(released), 1)
+        worker = released[0]
+        self.assertIsNot(worker, threading.main_thread())
+        self.assertEqual(worker.name, 'read-ahead')
+        self.assertFalse(worker.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
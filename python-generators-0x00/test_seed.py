@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the load backends, CSV partitioning and sync of the seed module.
+
+The database side is replaced by a cursor that records every statement, so
+the staging files, SQL and backend choice can be checked without MySQL.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from mysql.connector import Error
+import seed
+
+ROWS = [
+    ('00000000-0000-0000-0000-000000000001', 'Alice', 'alice@example.com', '30'),
+    ('00000000-0000-0000-0000-000000000002', 'Bob, Jr.', 'bob@example.com', '20'),
+    ('00000000-0000-0000-0000-000000000003', 'Carol "C"', 'carol@example.com', '40'),
+]
+
+
+class RecordingCursor:
+    """A cursor that records statements and the staging file LOAD DATA reads."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.closed = False
+
+    def execute(self, query, params=None):
+        query = ' '.join(query.split())
+        self.connection.statements.append(query)
+        if query.startswith(self.connection.fail_on or '\0'):
+            raise Error(f"Failed: {query[:40]}")
+        if query.startswith("LOAD DATA"):
+            self.connection.staging_path = params[0]
+            with open(params[0], newline='') as file:
+                self.connection.staging_file = file.read()
+
+    def close(self):
+        self.closed = True
+
+
+class RecordingConnection:
+    """A connection handing out RecordingCursors and counting commits."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.statements = []
+        self.commits = 0
+        self.staging_path = None
+        self.staging_file = None
+
+    def cursor(self, **kwargs):
+        return RecordingCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestBulkLoadData(unittest.TestCase):
+    """
+    Test case for the LOAD DATA LOCAL INFILE backend.
+    """
+
+    def test_stages_loads_and_merges(self):
+        """Rows go through a staging file and table into one merge."""
+        connection = RecordingConnection()
+        self.assertEqual(seed.bulk_load_data(connection, iter(ROWS)), 3)
+
+        self.assertEqual(connection.staging_file,
+                         '00000000-0000-0000-0000-000000000001,Alice,alice@example.com,30\n'
+                         '00000000-0000-0000-0000-000000000002,"Bob, Jr.",bob@example.com,20\n'
+                         '00000000-0000-0000-0000-000000000003,"Carol ""C""",carol@example.com,40\n')
+        statements = connection.statements
+        self.assertEqual(statements[0], "DROP TEMPORARY TABLE IF EXISTS user_data_staging;")
+        self.assertEqual(statements[1], "CREATE TEMPORARY TABLE user_data_staging LIKE user_data;")
+        self.assertTrue(statements[2].startswith("LOAD DATA LOCAL INFILE %s INTO TABLE user_data_staging"))
+        self.assertIn("SET user_id = UUID_TO_BIN(@user_id)", statements[2])
+        self.assertTrue(statements[3].startswith(
+            "INSERT INTO user_data (user_id, name, email, age) "
+            "SELECT user_id, name, email, age FROM user_data_staging ON DUPLICATE KEY UPDATE"))
+        self.assertEqual(statements[4:], ["DROP TEMPORARY TABLE IF EXISTS user_data_staging;"])
+        self.assertEqual(connection.commits, 1)
+        self.assertFalse(os.path.exists(connection.staging_path))
+
+    def test_failed_merge_cleans_up(self):
+        """A failed merge still drops the staging table and removes the file."""
+        connection = RecordingConnection(fail_on="INSERT INTO user_data")
+        with self.assertRaises(Error):
+            seed.bulk_load_data(connection, iter(ROWS))
+        self.assertEqual(connection.statements[-1],
+                         "DROP TEMPORARY TABLE IF EXISTS user_data_staging;")
+        self.assertEqual(connection.commits, 0)
+        self.assertFalse(os.path.exists(connection.staging_path))
+
+
+class TestPartitionCsv(unittest.TestCase):
+    """
+    Test case for splitting a CSV file into byte ranges for --workers.
+    """
+
+    def write_csv(self, lines, trailing_newline=True):
+        """Write a header and lines to a temporary CSV file and return its path."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        file_path = os.path.join(directory.name, 'user_data.csv')
+        with open(file_path, 'w', newline='') as file:
+            file.write('\n'.join(['name,email,age'] + lines))
+            if trailing_newline:
+                file.write('\n')
+        return file_path
+
+    def assert_rows_read_once(self, file_path, max_workers=12):
+        """Every partitioning reads each row of the file exactly once, in order."""
+        expected = list(seed.stream_csv(file_path, keyed=True))
+        for workers in range(1, max_workers + 1):
+            with self.subTest(workers=workers):
+                partitions = seed.partition_csv(file_path, workers)
+                self.assertLessEqual(len(partitions), workers)
+                rows = [row for start, end in partitions
+                        for row in seed.stream_csv_range(file_path, start, end, keyed=True)]
+                self.assertEqual(rows, expected)
+
+    def test_every_row_read_once(self):
+        """Rows of uneven length are neither lost nor duplicated for any worker count."""
+        lines = [f'{"User" * (number % 7 + 1)} {number},user{number}@example.com,{number % 90}'
+                 for number in range(50)]
+        self.assert_rows_read_once(self.write_csv(lines))
+
+    def test_no_trailing_newline(self):
+        """The last row is read even when the file does not end in a newline."""
+        lines = [f'User {number},user{number}@example.com,{number}' for number in range(7)]
+        file_path = self.write_csv(lines, trailing_newline=False)
+        self.assertEqual(len(list(seed.stream_csv(file_path))), 7)
+        self.assert_rows_read_once(file_path)
+
+    def test_more_workers_than_rows(self):
+        """Extra workers get no empty ranges."""
+        file_path = self.write_csv(['Alice,alice@example.com,30', 'Bob,bob@example.com,20'])
+        partitions = seed.partition_csv(file_path, 8)
+        self.assertTrue(all(end > start for start, end in partitions))
+        self.assert_rows_read_once(file_path)
+
+    def test_header_only(self):
+        """A file with no data rows has no partitions."""
+        self.assertEqual(seed.partition_csv(self.write_csv([]), 4), [])
+
+
+class SyncDatabase:
+    """A stand-in for user_data and user_data_sync, driven by sync_data's SQL.
+
+    user_ids are kept as UUID strings, whose order matches that of the
+    BINARY(16) keys. Every merged key range is recorded in merges.
+    """
+
+    def __init__(self, stored=None):
+        self.stored = dict(stored or {})
+        self.staged = {}
+        self.ranges = []
+        self.merges = []
+        self.statements = []
+        self.result = None
+
+    def cursor(self, **kwargs):
+        return self
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+    def fetchone(self):
+        return self.result
+
+    def executemany(self, query, rows):
+        for user_id, name, email, age in rows:
+            self.staged[user_id] = (name, email, age)
+
+    def changed(self, query, params):
+        """The staged keys in the query's key range that differ from user_data."""
+        params = list(params)
+        low = params.pop(0) if "s.user_id > %s" in query else None
+        high = params.pop(0) if "s.user_id <= %s" in query else None
+        return (low, high), [
+            user_id for user_id in sorted(self.staged)
+            if (low is None or user_id > low) and (high is None or user_id <= high)
+            and self.stored.get(user_id) != self.staged[user_id]
+        ]
+
+    def execute(self, query, params=()):
+        query = ' '.join(query.split())
+        self.statements.append(query)
+        if query.startswith("DROP TEMPORARY TABLE IF EXISTS user_data_sync"):
+            self.staged = {}
+        elif query.startswith("SELECT COUNT(*) FROM user_data_sync;"):
+            self.result = (len(self.staged),)
+        elif query.startswith("SELECT user_id FROM user_data_sync"):
+            *low, offset = params
+            keys = [user_id for user_id in sorted(self.staged) if not low or user_id > low[0]]
+            self.result = (keys[offset],) if offset < len(keys) else None
+        elif query.startswith("SELECT COUNT(*) FROM user_data_sync s"):
+            key_range, changed = self.changed(query, params)
+            self.ranges.append(key_range)
+            self.result = (len(changed),)
+        elif query.startswith("INSERT INTO user_data"):
+            key_range, changed = self.changed(query, params)
+            self.merges.append((key_range, len(changed)))
+            for user_id in changed:
+                self.stored[user_id] = self.staged[user_id]
+
+
+class TestSyncData(unittest.TestCase):
+    """
+    Test case for the keyset-batched incremental sync.
+    """
+
+    def setUp(self):
+        """Write a 23-row CSV file and read the rows it stages."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_path = os.path.join(directory.name, 'user_data.csv')
+        self.write_csv(23)
+
+    def write_csv(self, count):
+        """Write count rows to the CSV file and keep their keyed rows."""
+        with open(self.file_path, 'w') as file:
+            file.write('name,email,age\n')
+            for number in range(count):
+                file.write(f'User {number},user{number}@example.com,{20 + number}\n')
+        self.rows = {user_id: (name, email, age)
+                     for user_id, name, email, age in seed.stream_csv(self.file_path, keyed=True)}
+
+    def assert_ranges_cover_keys(self, database, chunk_size):
+        """The batches chain from the first key to the last, chunk_size keys each."""
+        keys = sorted(self.rows)
+        ranges = database.ranges
+        self.assertIsNone(ranges[0][0])
+        self.assertIsNone(ranges[-1][1])
+        for (_, high), (low, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(low, high)
+        for low, high in ranges:
+            in_range = [key for key in keys
+                        if (low is None or key > low) and (high is None or key <= high)]
+            self.assertLessEqual(len(in_range), chunk_size)
+        self.assertEqual(len(ranges), len(keys) // chunk_size + 1)
+
+    def test_empty_table_writes_every_row(self):
+        """Into an empty table every staged row is written, chunk by chunk."""
+        database = SyncDatabase()
+        self.assertEqual(seed.sync_data(database, self.file_path, chunk_size=5), (23, 0))
+        self.assertEqual(database.stored, self.rows)
+        self.assertEqual([count for _, count in database.merges], [5, 5, 5, 5, 3])
+        self.assert_ranges_cover_keys(database, 5)
+        self.assertEqual(database.statements[-1], "DROP TEMPORARY TABLE IF EXISTS user_data_sync;")
+
+    def test_unchanged_rows_are_skipped(self):
+        """Re-syncing the same file writes nothing."""
+        database = SyncDatabase(self.rows)
+        self.assertEqual(seed.sync_data(database, self.file_path, chunk_size=5), (0, 23))
+        self.assertEqual(database.merges, [])
+        self.assert_ranges_cover_keys(database, 5)
+
+    def test_only_new_and_changed_rows_are_written(self):
+        """Rows missing from or differing in user_data are written; the rest skipped."""
+        keys = sorted(self.rows)
+        stored = dict(self.rows)
+        for key in keys[:3]:
+            del stored[key]
+        for key in keys[10:12]:
+            name, email, age = stored[key]
+            stored[key] = (name, email, '99')
+        database = SyncDatabase(stored)
+        self.assertEqual(seed.sync_data(database, self.file_path, chunk_size=4), (5, 18))
+        self.assertEqual(database.stored, self.rows)
+        self.assertEqual(sum(count for _, count in database.merges), 5)
+        self.assert_ranges_cover_keys(database, 4)
+
+    def test_row_count_multiple_of_chunk_size(self):
+        """When the rows fill the last chunk exactly, a final empty range ends the sync."""
+        self.write_csv(20)
+        database = SyncDatabase()
+        self.assertEqual(seed.sync_data(database, self.file_path, chunk_size=5), (20, 0))
+        self.assertEqual([count for _, count in database.merges], [5, 5, 5, 5])
+        self.assert_ranges_cover_keys(database, 5)
+
+
+class TestMainBackendChoice(unittest.TestCase):
+    """
+    Test case for main choosing the load backend by the CSV row count.
+    """
+
+    def setUp(self):
+        """Write a three-row CSV file and stub out the database steps."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_path = os.path.join(directory.name, 'user_data.csv')
+        with open(self.file_path, 'w') as file:
+            file.write('name,email,age\n')
+            for _, name, email, age in ROWS:
+                file.write(f'{name.split()[0]},{email},{age}\n')
+
+        self.stubs = {name: MagicMock(name=name) for name in (
+            'connect_db', 'create_database', 'connect_to_prodev', 'create_table',
+            'migrate_schema', 'get_index_sizes', 'report_index_sizes',
+            'drop_secondary_indexes', 'apply_indexes', 'bulk_load_data',
+            'insert_data_in_chunks')}
+        self.stubs['bulk_load_data'].return_value = 3
+        self.stubs['insert_data_in_chunks'].return_value = 3
+        patcher = patch.multiple(seed, **self.stubs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bulk_loads_above_threshold(self):
+        """More rows than the threshold use LOAD DATA over a local-infile connection."""
+        seed.main(self.file_path, bulk_load_threshold=2)
+        self.stubs['connect_to_prodev'].assert_called_once_with(allow_local_infile=True)
+        self.stubs['bulk_load_data'].assert_called_once()
+        self.stubs['insert_data_in_chunks'].assert_not_called()
+        self.stubs['drop_secondary_indexes'].assert_called_once()
+        self.stubs['apply_indexes'].assert_called_once()
+
+    def test_inserts_in_chunks_at_or_below_threshold(self):
+        """Up to the threshold, rows are inserted in chunks and indexes are kept."""
+        seed.main(self.file_path, chunk_size=2, bulk_load_threshold=3)
+        self.stubs['connect_to_prodev'].assert_called_once_with(allow_local_infile=False)
+        self.stubs['bulk_load_data'].assert_not_called()
+        self.stubs['insert_data_in_chunks'].assert_called_once()
+        self.assertEqual(self.stubs['insert_data_in_chunks'].call_args.args[2], 2)
+        self.stubs['drop_secondary_indexes'].assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
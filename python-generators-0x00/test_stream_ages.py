@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the age reductions in 4-stream_ages.
+
+The connection is replaced by a stand-in whose cursor returns fixed results.
+"""
+import importlib
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+stream_ages = importlib.import_module('4-stream_ages')
+
+
+class TestAggregateAges(unittest.TestCase):
+    """
+    Test case for aggregate_ages name validation and empty tables.
+    """
+
+    def connect(self, aggregates, percentile_row=None):
+        """Serve aggregates for AGGREGATE_SQL and percentile_row for percentiles."""
+        cursor = MagicMock()
+        cursor.fetchone.side_effect = lambda: (
+            aggregates if cursor.execute.call_args.args[0] == stream_ages.AGGREGATE_SQL
+            else percentile_row)
+        connection = MagicMock()
+        connection.cursor.return_value = cursor
+        for name, value in (('connect_to_prodev', connection), ('release_connection', None)):
+            patcher = patch.object(stream_ages, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return connection
+
+    def test_empty_table(self):
+        """On an empty table the count is 0 and the other aggregates are None."""
+        self.connect((0, None, None, None, None))
+        self.assertEqual(stream_ages.aggregate_ages('count', 'sum', 'min', 'avg', 'stddev', 'p50'),
+                         {'count': 0, 'sum': 0, 'min': None, 'avg': None, 'stddev': None,
+                          'p50': None})
+
+    def test_unknown_names_raise_on_empty_table(self):
+        """Bad names are rejected before the count is looked at."""
+        self.connect((0, None, None, None, None))
+        for name in ('bogus', 'p500', 'p', 'p-1'):
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                stream_ages.aggregate_ages('count', name)
+
+    def test_bad_name_fails_before_connecting(self):
+        """A bad name fails without opening a connection."""
+        connection = self.connect((3, 90, 2900, 20, 40))
+        with self.assertRaises(ValueError):
+            stream_ages.aggregate_ages('avg', 'p101')
+        stream_ages.connect_to_prodev.assert_not_called()
+        connection.cursor.assert_not_called()
+
+    def test_aggregates(self):
+        """Aggregates are computed exactly from the single aggregate row."""
+        self.connect((3, 90, 2900, 20, 40), percentile_row=(30,))
+        self.assertEqual(stream_ages.aggregate_ages('avg', 'variance', 'max', 'p50'),
+                         {'avg': 30, 'variance': Decimal(200) / 3, 'max': 40, 'p50': 30})
+
+
+if __name__ == '__main__':
+    unittest.main()